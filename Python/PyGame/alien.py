@@ -3,6 +3,7 @@
 
 import pygame
 from pygame.sprite import Sprite
+from assets import load_image, load_mask
 
 class Alien(Sprite):
     """表示单个外星人的类"""
@@ -12,11 +13,13 @@ class Alien(Sprite):
         super(Alien, self).__init__()
         
         self.screen = screen
+        self.screen_rect = screen.get_rect() # 屏幕尺寸不变，只取一次
         self.ai_settings = ai_settings
 
         # 加载外星人图像，并设置其rect属性
-        self.image = pygame.image.load(r'E:\Python-Substance\Python\PyGame\images\alien.bmp')
+        self.image = load_image('alien.bmp') # 所有外星人共享同一张贴图
         self.rect = self.image.get_rect()
+        self.mask = load_mask('alien.bmp') # 像素碰撞用的掩码，同样共享
 
         # 每个外星人最初都在屏幕左上角附近
         self.rect.x = self.rect.width
@@ -27,7 +30,7 @@ class Alien(Sprite):
 
     def check_edges(self):
         """如果外星人位于屏幕边缘，就返回True"""
-        screen_rect = self.screen.get_rect()
+        screen_rect = self.screen_rect
         if self.rect.right >= screen_rect.right:
             return True
         elif self.rect.left <= 0:
@@ -35,7 +38,8 @@ class Alien(Sprite):
 
     def update(self):
         """向右移动外星人"""
-        self.x += self.ai_settings.alien_speed_factor * self.ai_settings.fleet_direction #向右移动
+        self.x += (self.ai_settings.alien_speed_factor * self.ai_settings.tick_dt
+                   * self.ai_settings.fleet_direction) #向右移动 速度×每帧时长
         self.rect.x = self.x #渲染矩形框坐标每次 重赋值 右移
 
     def blitme(self):
@@ -3,39 +3,157 @@
 # Main function
 
 import sys
+import startup_profile
+if __name__ == '__main__' and '--startup-profile' in sys.argv: # 要在导入其他模块之前开始记录导入耗时
+    startup_profile.start()
+
 import pygame
 from settings import Settings
 from ship import Ship
-from alien import Alien
 import game_functions as gf 
-from pygame.sprite import Group
 from game_stats import GameStats
 from button import Button
 from scoreboard import Scoreboard
+from assets import assets
+from game_clock import GameClock
+from dirty_renderer import DirtyRenderer
+from hud import HudOverlay
+from profiler import FrameProfiler
+from gc_policy import GcPolicy
+from telemetry import telemetry
+from startup_profile import step
 
-def run_game():
+def run_game(ai_settings=None):
     
-    pygame.init() # 初始化游戏并创建一个屏幕对象
-    ai_settings = Settings() #初始化设置 
-    screen = pygame.display.set_mode((ai_settings.screen_width, 
-                                    ai_settings.screen_height)) #画布设置，面布大小
-
-    pygame.display.set_caption("Alien Invasion") #项目名称
-    play_button = Button(ai_settings, screen, "Play") #创建按键
-    stats = GameStats(ai_settings)   #创建一个用于存储游戏统计信息的实例
-    sb = Scoreboard(ai_settings, screen, stats)
+    with step('display'):
+        pygame.display.init() # 只初始化用到的显示模块（字体用到时才初始化），不再pygame.init()探测音频等设备
+        ai_settings = ai_settings or Settings() #初始化设置 
+        screen = pygame.display.set_mode((ai_settings.screen_width, 
+                                        ai_settings.screen_height)) #画布设置，面布大小
+        pygame.display.set_caption("Alien Invasion") #项目名称
+    with step('play_button'):
+        play_button = Button(ai_settings, screen, "Play") #创建按键 第一次创建共享字体
+    gf.show_play_screen(ai_settings, screen, play_button) # 先让Play界面出现，其余初始化放到第一帧之后
+    startup_profile.mark('first frame')
 
-    ship = Ship(ai_settings, screen) # 新画布上创建飞船
-    bullets = Group() # 实例精灵图组
-    aliens = Group() # 画布上创建外星人
-    gf.create_fleet(ai_settings, screen, ship, aliens) # 创建外星人群
+    with step('assets'):
+        assets.preload('ship.bmp', 'alien.bmp') # 窗口创建后一次性加载并转换贴图，之后所有精灵共享
+    with step('scoreboard'):
+        stats = GameStats(ai_settings)   #创建一个用于存储游戏统计信息的实例
+        sb = Scoreboard(ai_settings, screen, stats)
+    with step('fleet'):
+        ship = Ship(ai_settings, screen) # 新画布上创建飞船
+        bullets = gf.create_bullet_group(ai_settings, screen) # 实例精灵图组 （默认为子弹池）
+        aliens = gf.create_alien_group(ai_settings) # 画布上创建外星人 带碰撞网格的编组
+        gf.create_fleet(ai_settings, screen, ship, aliens) # 创建外星人群
+    with step('renderer'):
+        if ai_settings.render_thread: # 渲染线程独占屏幕，主循环按tick_rate只推进逻辑
+            from render_thread import RenderThread, take_snapshot # 可选功能的模块用到时才导入
+            render_thread = RenderThread(ai_settings, screen, play_button)
+            clock = GameClock(ai_settings, ai_settings.tick_rate)
+            hud = renderer = None
+        else:
+            render_thread = None
+            clock = GameClock(ai_settings) # 固定步长时钟，限制帧率
+            hud = HudOverlay(ai_settings, screen, stats, sb, play_button) if ai_settings.hud_overlay else None
+            if ai_settings.adaptive_resolution: # 每帧都放大整屏，不再使用脏矩形
+                from scaled_renderer import ScaledRenderer
+                renderer = ScaledRenderer(ai_settings, screen, clock, hud)
+            elif ai_settings.dirty_rect_rendering:
+                renderer = DirtyRenderer(ai_settings, screen, hud)
+            else:
+                renderer = None
+    with step('diagnostics'):
+        prof = FrameProfiler(ai_settings) # 逐阶段帧耗时分析，Settings.profiling为False时不计时
+        if renderer:
+            renderer.overlays.append(prof)
+        recorder = None
+        if ai_settings.record_path:
+            from replay import InputRecorder
+            recorder = InputRecorder(ai_settings.record_path, ai_settings)
+        telemetry.configure(ai_settings) # 有telemetry_path时启动后台写入线程
+        tracker = None
+        if ai_settings.memory_report:
+            from memory_tracker import MemoryTracker
+            tracker = MemoryTracker(ai_settings, lambda: (ship, aliens, bullets, sb.ships))
+    with step('gc.freeze'):
+        gc_policy = GcPolicy(ai_settings, prof) # 回收暂停记入帧分析的'gc'统计
+        gc_policy.freeze() # 启动时创建的对象不再参与回收
+    startup_profile.finish() # --startup-profile时输出导入和初始化耗时
      
-    while True:  # 游戏主循环
-        gf.check_events(ai_settings, screen, stats, sb, play_button, ship, aliens, bullets) # 事件循环 侦探
-        if stats.game_active: #检测游戏生命
-            ship.update() # 物件循环
-            gf.update_bullets(ai_settings, screen, stats, sb, ship, aliens, bullets) # 子弹模块
-            print(len(bullets))  # 游戏运行时打印消息（在控制台内）子弹循环测试
-            gf.update_aliens(ai_settings, screen, stats, sb, ship, aliens, bullets) #外星人模块      
-        gf.update_screen(ai_settings, screen, stats, sb, ship, aliens, bullets, play_button)  # 渲染管线设置 帧循环
-run_game()
+    try:
+        if render_thread:
+            render_thread.publish(take_snapshot(ai_settings, screen, stats, sb, ship, aliens, bullets))
+            render_thread.start()
+        published = None # 上一个快照发布时的统计信息版本号
+        while True:  # 游戏主循环
+            ticks = clock.advance() # 等待下一帧，得到本帧需要推进的逻辑帧数
+            with prof.phase('check_events'):
+                gf.check_events(ai_settings, screen, stats, sb, play_button, ship, aliens, bullets, recorder) # 事件循环 侦探
+            ran = 0 # 实际推进的逻辑帧数（含重生暂停的倒计时）
+            for tick in range(ticks):
+                if not stats.game_active: #检测游戏生命
+                    break
+                ran += 1
+                if gf.update_respawn(stats): # 飞船被撞后的暂停，只倒计时不推进逻辑，也不计入录制的逻辑帧
+                    continue
+                with prof.phase('ship.update'):
+                    ship.update() # 物件循环
+                with prof.phase('update_bullets'):
+                    gf.update_bullets(ai_settings, screen, stats, sb, ship, aliens, bullets) # 子弹模块
+                telemetry.event('bullets', count=len(bullets)) # 子弹循环测试，按telemetry_sample采样记录
+                with prof.phase('update_aliens'):
+                    gf.update_aliens(ai_settings, screen, stats, sb, ship, aliens, bullets) #外星人模块      
+                if recorder:
+                    recorder.end_tick(ai_settings, stats, ship, aliens, bullets)
+            with prof.phase('update_screen'):
+                if render_thread: # 只发布快照，绘制在渲染线程里进行
+                    versions = tuple(stats.versions[name] for name in stats.TRACKED)
+                    if ran or versions != published: # 没有推进逻辑时重发同样的状态会让插值从头开始，画面顿挫
+                        render_thread.publish(take_snapshot(ai_settings, screen, stats, sb, ship, aliens, bullets))
+                        published = versions
+                elif renderer:
+                    renderer.update_screen(stats, sb, ship, aliens, bullets, play_button) # 只提交变化区域
+                else:
+                    gf.update_screen(ai_settings, screen, stats, sb, ship, aliens, bullets, play_button, hud)  # 渲染管线设置 帧循环
+                    prof.draw_overlay(screen)
+            with prof.phase('prepare_next_fleet'):
+                gf.prepare_next_fleet(ai_settings, screen, ship) # 利用帧的空闲时间预先创建下一波外星人
+            gc_policy.update(stats) # 过关、掉命时显式回收，关卡中限制自动回收
+            prof.end_frame(ticks)
+    finally: # 关闭窗口或按Q退出时停止渲染线程，保存CSV和输入日志
+        if render_thread:
+            render_thread.stop()
+        gc_policy.close()
+        if tracker:
+            tracker.close()
+        prof.close()
+        if recorder:
+            recorder.close()
+        telemetry.close()
+
+if __name__ == '__main__':
+    if '--headless' in sys.argv: # 无窗口模拟模式，见headless.py
+        import headless
+        headless.main([arg for arg in sys.argv[1:] if arg != '--headless'])
+    else:
+        ai_settings = Settings()
+        for arg in sys.argv[1:]:
+            if arg == '--profile': # 开启帧耗时分析，游戏中按F3显示
+                ai_settings.profiling = True
+            elif arg.startswith('--profile-csv='): # 开启分析并把每帧记录写入CSV
+                ai_settings.profiling = True
+                ai_settings.profile_csv = arg.split('=', 1)[1]
+            elif arg.startswith('--record='): # 录制输入日志，用replay.py回放
+                ai_settings.record_path = arg.split('=', 1)[1]
+            elif arg == '--adaptive-resolution': # 低配机器上自动降低内部分辨率保持帧率
+                ai_settings.adaptive_resolution = True
+            elif arg.startswith('--memory-report='): # 按关卡记录内存增长
+                ai_settings.memory_report = arg.split('=', 1)[1]
+            elif arg == '--startup-profile': # 输出启动时每个导入和初始化步骤的耗时（导入在文件开头已开始记录）
+                pass
+            elif arg == '--render-thread': # 逻辑与渲染分到两个线程
+                ai_settings.render_thread = True
+            elif arg.startswith('--telemetry='): # 把遥测事件写入JSON-lines文件
+                ai_settings.telemetry_path = arg.split('=', 1)[1]
+        run_game(ai_settings)
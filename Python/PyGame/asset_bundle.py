@@ -0,0 +1,117 @@
+# 时间：20261017
+# 功能：打包的贴图资源文件
+# 把images目录下的贴图预先解码成原始像素，连同索引写进一个文件；运行时mmap这个文件，
+# 用pygame.image.frombuffer直接从映射的内存创建Surface，不再逐个打开、解码图片文件
+#
+# 文件格式：头部 <4sHI（标识、版本、索引长度），随后是UTF-8的JSON索引
+# {文件名: {"width", "height", "format", "offset", "size"}}，最后是按16字节对齐的像素数据
+
+import json
+import mmap
+import os
+import struct
+import sys
+
+import pygame
+
+MAGIC = b'AIB1'
+VERSION = 1
+HEADER = struct.Struct('<4sHI')
+ALIGN = 16
+IMAGE_TYPES = ('.bmp', '.png', '.jpg', '.gif')
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+IMAGES_DIR = os.path.join(GAME_DIR, 'images')
+BUNDLE_PATH = os.path.join(GAME_DIR, 'images.bundle') # 默认的打包文件，与本模块放在同一目录（冻结后也一样）
+
+
+def pack(images_dir, out_path):
+    """把目录下的所有贴图打包成一个文件，返回打包的文件名列表"""
+    names = sorted(name for name in os.listdir(images_dir) if name.lower().endswith(IMAGE_TYPES))
+    index = {}
+    blobs = []
+    offset = 0
+    for name in names:
+        surface = pygame.image.load(os.path.join(images_dir, name))
+        fmt = 'RGBA' if surface.get_flags() & pygame.SRCALPHA else 'RGB'
+        pixels = pygame.image.tostring(surface, fmt)
+        width, height = surface.get_size()
+        index[name] = {'width': width, 'height': height, 'format': fmt, 'offset': offset, 'size': len(pixels)}
+        padding = -len(pixels) % ALIGN
+        blobs.append(pixels + b'\0' * padding)
+        offset += len(pixels) + padding
+
+    index_bytes = json.dumps(index, sort_keys=True).encode('utf-8')
+    index_bytes += b' ' * (-(HEADER.size + len(index_bytes)) % ALIGN) # 让像素数据从对齐的位置开始
+    with open(out_path, 'wb') as out:
+        out.write(HEADER.pack(MAGIC, VERSION, len(index_bytes)))
+        out.write(index_bytes)
+        for blob in blobs:
+            out.write(blob)
+    return names
+
+
+class AssetBundle():
+    """只读映射的打包文件，按文件名创建Surface"""
+
+    def __init__(self, path):
+        """映射文件并读取索引"""
+        with open(path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) # 映射后文件可以关闭
+        magic, version, index_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("{}不是版本{}的贴图打包文件".format(path, VERSION))
+        self.data_start = HEADER.size + index_length
+        self.index = json.loads(self.map[HEADER.size:self.data_start].decode('utf-8'))
+        self.view = memoryview(self.map)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def surface(self, name):
+        """返回直接引用映射内存的Surface（只读，不复制像素）"""
+        entry = self.index[name]
+        start = self.data_start + entry['offset']
+        pixels = self.view[start:start + entry['size']]
+        return pygame.image.frombuffer(pixels, (entry['width'], entry['height']), entry['format'])
+
+
+def is_stale(path, images_dir=IMAGES_DIR):
+    """images目录里有比打包文件更新的贴图（或增删过文件）时返回True；没有images目录（冻结后）时不算过期"""
+    if not os.path.isdir(images_dir):
+        return False
+    newest = os.path.getmtime(images_dir) # 增删文件会更新目录的修改时间
+    for name in os.listdir(images_dir):
+        if name.lower().endswith(IMAGE_TYPES):
+            newest = max(newest, os.path.getmtime(os.path.join(images_dir, name)))
+    return newest > os.path.getmtime(path)
+
+
+def open_bundle(path=BUNDLE_PATH, images_dir=IMAGES_DIR):
+    """打包文件存在且不比images目录旧时返回AssetBundle，否则返回None（直接读images目录）"""
+    if not os.path.exists(path):
+        return None
+    if is_stale(path, images_dir):
+        print("{}比{}旧，改为读取贴图文件；运行python asset_bundle.py重新打包".format(path, images_dir),
+              file=sys.stderr)
+        return None
+    return AssetBundle(path)
+
+
+def main(argv=None):
+    """命令行入口：python asset_bundle.py [贴图目录] [输出文件]；--list 列出已有打包文件的索引"""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--list':
+        bundle = AssetBundle(argv[1] if len(argv) > 1 else BUNDLE_PATH)
+        for name, entry in sorted(bundle.index.items()):
+            print("{}  {}x{} {}  {} bytes".format(name, entry['width'], entry['height'],
+                                                  entry['format'], entry['size']))
+        return
+    images_dir = argv[0] if argv else IMAGES_DIR
+    out_path = argv[1] if len(argv) > 1 else BUNDLE_PATH
+    names = pack(images_dir, out_path)
+    print("packed {} images into {} ({} bytes)".format(len(names), out_path, os.path.getsize(out_path)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# 时间：20261017
+# 功能：贴图资源管理 按包内相对路径加载贴图，每张图只解码、convert()一次，所有精灵共享同一个Surface
+# 有打包文件images.bundle（asset_bundle.py生成）时从映射的打包文件创建贴图，不再逐个读盘解码
+
+import os
+import pygame
+import asset_bundle
+
+IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'images') # 贴图目录，相对本文件定位
+
+
+class AssetCache():
+    """缓存已加载贴图的类，并统计加载次数与命中次数"""
+
+    def __init__(self, images_dir=IMAGES_DIR, bundle_path=asset_bundle.BUNDLE_PATH):
+        """初始化缓存"""
+        self.images_dir = images_dir
+        self.bundle_path = bundle_path
+        self.bundle = None # 第一次加载贴图时才映射打包文件
+        self.bundle_checked = False
+        self.images = {} # 文件名 -> Surface
+        self.masks = {} # 文件名 -> 像素碰撞用的Mask
+        self.converted = set() # 已转换为屏幕像素格式的文件名
+        self.loads = 0 # 真正读盘解码的次数
+        self.hits = 0 # 直接命中缓存的次数
+
+    def path(self, name):
+        """返回贴图的完整路径"""
+        return os.path.join(self.images_dir, name)
+
+    def image(self, name):
+        """返回共享的贴图Surface，第一次使用时才读盘"""
+        surface = self.images.get(name)
+        if surface is None:
+            bundle = self.get_bundle()
+            if bundle is not None and name in bundle:
+                surface = bundle.surface(name) # 像素直接来自映射的内存
+            else:
+                surface = pygame.image.load(self.path(name))
+            self.images[name] = surface
+            self.loads += 1
+        else:
+            self.hits += 1
+
+        # convert()需要先创建显示窗口；窗口创建前加载的图，等窗口出现后再补转换
+        if name not in self.converted and pygame.display.get_surface() is not None:
+            surface = surface.convert()
+            self.images[name] = surface
+            self.converted.add(name)
+        return surface
+
+    def get_bundle(self):
+        """返回打包文件；不存在时返回None，贴图从images目录读取"""
+        if not self.bundle_checked:
+            self.bundle_checked = True
+            if self.bundle_path:
+                self.bundle = asset_bundle.open_bundle(self.bundle_path, self.images_dir)
+        return self.bundle
+
+    def mask(self, name):
+        """返回贴图的像素掩码，每张图只生成一次；贴图没有透明通道，左上角像素的颜色视为背景"""
+        mask = self.masks.get(name)
+        if mask is None:
+            surface = self.image(name)
+            mask = pygame.mask.from_threshold(surface, surface.get_at((0, 0)), (1, 1, 1, 255))
+            mask.invert() # from_threshold选中的是背景像素，取反后是图形本身
+            self.masks[name] = mask
+        return mask
+
+    def preload(self, *names):
+        """预先加载一组贴图"""
+        for name in names:
+            self.image(name)
+
+    def clear(self):
+        """清空缓存和统计（例如重新创建显示窗口之后）"""
+        self.images.clear()
+        self.masks.clear()
+        self.converted.clear()
+        self.loads = 0
+        self.hits = 0
+
+    def stats(self):
+        """返回加载与命中统计"""
+        return {'loads': self.loads, 'hits': self.hits, 'cached': len(self.images),
+                'masks': len(self.masks), 'bundle': self.bundle is not None}
+
+
+# 整个游戏共用一个缓存实例
+assets = AssetCache()
+
+
+def load_image(name):
+    """从共享缓存中取得贴图"""
+    return assets.image(name)
+
+
+def load_mask(name):
+    """从共享缓存中取得贴图的像素掩码"""
+    return assets.mask(name)
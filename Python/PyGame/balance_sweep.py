@@ -0,0 +1,135 @@
+# 时间：20261017
+# 功能：Settings平衡性批量模拟
+# 把无窗口游戏分发到multiprocessing进程池：每个任务用一组Settings取值和一个随机种子运行脚本策略，
+# 汇总每组取值的到达等级、得分和存活帧数，代替手动试玩调参
+
+import csv
+import itertools
+import multiprocessing
+import random
+import sys
+import time
+
+# 默认扫描的参数网格
+DEFAULT_GRID = {
+    'speedup_scale': (1.1, 1.5, 3),
+    'score_scale': (1.5,),
+    'alien_speed_factor': (30, 60, 120),
+    'fleet_drop_speed': (5, 10),
+}
+
+# Play后会被initialize_dynamic_settings重置的设置，要在开始游戏之后再覆盖
+DYNAMIC_SETTINGS = ('ship_speed_factor', 'bullet_speed_factor', 'alien_speed_factor', 'alien_points')
+
+
+def scripted_policy(rng):
+    """带随机种子的脚本策略：每隔一段随机时间换一个方向，随机开火"""
+    import headless
+    state = {'inputs': (), 'until': 0}
+
+    def policy(game_state):
+        if game_state['tick'] >= state['until']:
+            move = rng.choice((headless.LEFT, headless.RIGHT, None))
+            state['inputs'] = (move,) if move else ()
+            state['until'] = game_state['tick'] + rng.randint(10, 90)
+        if rng.random() < 0.3:
+            return state['inputs'] + (headless.FIRE,)
+        return state['inputs']
+    return policy
+
+
+def play(task):
+    """工作进程：用一组设置和一个种子玩一局，返回结果字典"""
+    import headless # 在工作进程里导入，设置dummy驱动
+    from settings import Settings
+
+    params, seed, max_ticks = task
+    random.seed(seed)
+    ai_settings = Settings()
+    for name, value in params.items():
+        if name not in DYNAMIC_SETTINGS:
+            setattr(ai_settings, name, value)
+    game = headless.HeadlessGame(ai_settings)
+    state = game.step((headless.PLAY,))
+    for name, value in params.items(): # 开始游戏时动态设置已被重置，这里再覆盖
+        if name in DYNAMIC_SETTINGS:
+            setattr(ai_settings, name, value)
+
+    policy = scripted_policy(random.Random(seed))
+    ticks = 0
+    while state['game_active'] and ticks < max_ticks:
+        state = game.step(policy(state))
+        ticks += 1
+    return {'params': params, 'seed': seed, 'level': state['level'],
+            'score': state['score'], 'ticks': ticks, 'finished': not state['game_active']}
+
+
+def expand_grid(grid):
+    """把参数网格展开为每组取值的字典列表"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def aggregate(results):
+    """按参数组合汇总：平均等级、平均得分、平均存活帧数"""
+    table = {}
+    for result in results:
+        key = tuple(sorted(result['params'].items()))
+        table.setdefault(key, []).append(result)
+    rows = []
+    for key in sorted(table):
+        runs = table[key]
+        row = dict(key)
+        row['runs'] = len(runs)
+        row['level'] = sum(run['level'] for run in runs) / float(len(runs))
+        row['score'] = sum(run['score'] for run in runs) / float(len(runs))
+        row['ticks'] = sum(run['ticks'] for run in runs) / float(len(runs))
+        row['finished'] = sum(1 for run in runs if run['finished'])
+        rows.append(row)
+    return rows
+
+
+def sweep(grid=None, seeds=4, max_ticks=20000, processes=None):
+    """在进程池中运行整个网格，返回 (汇总表, 全部结果, 耗时秒数)"""
+    tasks = [(params, seed, max_ticks)
+             for params in expand_grid(grid or DEFAULT_GRID) for seed in range(seeds)]
+    start = time.perf_counter()
+    pool = multiprocessing.Pool(processes) # processes为None时使用全部CPU核心
+    try:
+        # 每个任务是一整局游戏，粒度足够粗，chunksize=1可以让各核心负载均衡
+        results = list(pool.imap_unordered(play, tasks, chunksize=1))
+    finally:
+        pool.close()
+        pool.join()
+    return aggregate(results), results, time.perf_counter() - start
+
+
+def write_table(rows, out):
+    """把汇总表写成CSV"""
+    if not rows:
+        return
+    writer = csv.DictWriter(out, fieldnames=list(rows[0].keys()))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    """命令行入口：python balance_sweep.py [--processes=N] [--seeds=N] [--max-ticks=N] [--out=文件]"""
+    argv = sys.argv[1:] if argv is None else argv
+    options = dict(arg[2:].split('=', 1) for arg in argv if arg.startswith('--') and '=' in arg)
+    processes = int(options['processes']) if 'processes' in options else None
+    rows, results, elapsed = sweep(seeds=int(options.get('seeds', 4)),
+                                   max_ticks=int(options.get('max-ticks', 20000)),
+                                   processes=processes)
+    if 'out' in options:
+        with open(options['out'], 'w', newline='') as out:
+            write_table(rows, out)
+    else:
+        write_table(rows, sys.stdout)
+    total_ticks = sum(result['ticks'] for result in results)
+    print("games: {}  seconds: {:.2f}  ticks/sec: {:,.0f}".format(
+        len(results), elapsed, total_ticks / elapsed if elapsed > 0 else 0.0), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
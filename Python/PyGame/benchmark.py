@@ -0,0 +1,224 @@
+# 时间：20261017
+# 功能：热点函数基准测试
+# 在无窗口模式下反复调用update_bullets、check_bullet_alien_collisions、update_aliens、create_fleet、update_screen，
+# 按场景（屏幕尺寸即外星人数量、子弹数、等级）统计每秒调用次数、单次耗时百分位和每次调用的内存分配，
+# 结果写成JSON，并可与保存的基线比较，变慢超过阈值时返回非零退出码
+
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1') # 不让pygame的欢迎信息混进输出的JSON
+import headless # 设置dummy驱动，必须在pygame之前导入
+import pygame
+import game_functions as gf
+from settings import Settings
+from profiler import percentile
+
+# 场景：screen为屏幕尺寸（决定外星人数量），bullets为同时飞行的子弹数，level为速度倍数对应的等级
+SCENARIOS = {
+    'default': {'screen': (1200, 800), 'bullets': 3, 'level': 1, 'fleet_backend': 'sprite'},
+    'bullets': {'screen': (1200, 800), 'bullets': 60, 'level': 1, 'fleet_backend': 'sprite'},
+    'fast': {'screen': (1200, 800), 'bullets': 10, 'level': 4, 'fleet_backend': 'sprite'},
+    'large': {'screen': (3600, 2400), 'bullets': 60, 'level': 1, 'fleet_backend': 'sprite'},
+    'large_numpy': {'screen': (3600, 2400), 'bullets': 60, 'level': 1, 'fleet_backend': 'numpy'},
+}
+
+TARGETS = ('update_bullets', 'check_bullet_alien_collisions', 'update_aliens', 'create_fleet', 'update_screen')
+
+
+class Bench():
+    """一个场景下的游戏对象，以及在每次计时调用前把它恢复到稳定状态的方法"""
+
+    def __init__(self, params, seed=0):
+        """按场景参数创建无窗口游戏并开始游戏"""
+        ai_settings = Settings()
+        ai_settings.screen_width, ai_settings.screen_height = params['screen']
+        ai_settings.bullet_allowed = params['bullets']
+        ai_settings.fleet_backend = params['fleet_backend']
+        self.params = params
+        self.game = headless.HeadlessGame(ai_settings)
+        self.game.step((headless.PLAY,))
+        for level in range(1, params['level']): # 与过关时相同的提速
+            ai_settings.increase_speed()
+            self.game.stats.level += 1
+        self.rng = random.Random(seed)
+        self.fleet_size = len(self.game.aliens)
+
+    def args(self):
+        """被测函数共同的参数"""
+        game = self.game
+        return (game.ai_settings, game.screen, game.stats, game.sb, game.ship, game.aliens, game.bullets)
+
+    def refill_fleet(self):
+        """外星人少于一半或快到达飞船时重新生成整群，避免关卡切换、掉命混入计时"""
+        game = self.game
+        limit = game.screen.get_rect().bottom - 2 * game.ship.rect.height
+        aliens = game.aliens
+        if len(aliens) < self.fleet_size // 2 or any(alien.rect.bottom >= limit for alien in aliens.sprites()):
+            aliens.empty()
+            gf.create_fleet(game.ai_settings, game.screen, game.ship, aliens)
+        game.stats.ships_left = game.ai_settings.ship_limit
+
+    def refill_bullets(self):
+        """把子弹补到bullet_allowed颗，随机分布在飞船上方"""
+        game = self.game
+        ship, bullets = game.ship, game.bullets
+        height = game.ai_settings.screen_height - ship.rect.height
+        while len(bullets) < game.ai_settings.bullet_allowed:
+            ship.rect.centerx = self.rng.randrange(game.ai_settings.screen_width)
+            gf.fire_bullet(game.ai_settings, game.screen, ship, bullets)
+        for bullet in bullets.sprites():
+            if bullet.rect.top >= ship.rect.top: # 刚发射的子弹
+                bullet.y = float(self.rng.randrange(height))
+                bullet.rect.y = bullet.y
+                if bullet.swept is not None:
+                    bullet.swept.update(bullet.rect)
+        ship.rect.centerx = ship.center
+
+    def prepare(self, target):
+        """计时前恢复状态（不计入耗时），返回被测的无参函数"""
+        game = self.game
+        self.refill_fleet()
+        if target == 'create_fleet':
+            game.aliens.empty()
+            return lambda: gf.create_fleet(game.ai_settings, game.screen, game.ship, game.aliens)
+        self.refill_bullets()
+        function = getattr(gf, target)
+        args = self.args()
+        if target == 'update_screen':
+            args = args[:7] + (game.play_button,)
+        return lambda: function(*args)
+
+
+def measure(bench, target, calls, alloc_calls, warmup=20):
+    """预热后计时calls次调用，再在tracemalloc下另跑alloc_calls次统计内存分配"""
+    for i in range(warmup): # 填满各处缓存（贴图、字形、阵型、子弹池）
+        bench.prepare(target)()
+    gc.collect() # 上一个函数留下的垃圾不要算到这个函数头上
+    timings = []
+    for i in range(calls):
+        call = bench.prepare(target)
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    blocks = 0
+    peak = 0
+    can_reset_peak = hasattr(tracemalloc, 'reset_peak') # Python 3.9+
+    gc.disable() # 不让垃圾回收干扰分配统计
+    tracemalloc.start()
+    try:
+        for i in range(alloc_calls):
+            call = bench.prepare(target)
+            before = sys.getallocatedblocks()
+            if can_reset_peak:
+                tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            call()
+            blocks += sys.getallocatedblocks() - before
+            peak += tracemalloc.get_traced_memory()[1] - current
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        'calls': calls,
+        'ticks_per_sec': calls / total if total > 0 else 0.0,
+        'p50_us': percentile(timings, 0.5) * 1e6,
+        'p90_us': percentile(timings, 0.9) * 1e6,
+        'p99_us': percentile(timings, 0.99) * 1e6,
+        'max_us': timings[-1] * 1e6,
+        'blocks_per_tick': blocks / float(alloc_calls) if alloc_calls else None, # 每次调用后净增的内存块
+        'peak_kib_per_tick': (peak / 1024.0 / alloc_calls) if alloc_calls and can_reset_peak else None,
+    }
+
+
+def available(params):
+    """场景所需的可选依赖是否已安装"""
+    if params['fleet_backend'] == 'numpy':
+        try:
+            import numpy
+        except ImportError:
+            return False
+    return True
+
+
+def run(names=None, calls=500, alloc_calls=100, targets=TARGETS):
+    """运行基准测试，返回可写成JSON的结果字典"""
+    results = {
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'scenarios': {},
+    }
+    for name in names or sorted(SCENARIOS):
+        params = SCENARIOS[name]
+        if not available(params):
+            print("跳过场景{}：缺少{}".format(name, params['fleet_backend']), file=sys.stderr)
+            continue
+        bench = Bench(params)
+        scenario = {'params': params, 'fleet': bench.fleet_size, 'targets': {}}
+        for target in targets:
+            scenario['targets'][target] = measure(bench, target, calls, alloc_calls)
+        results['scenarios'][name] = scenario
+    return results
+
+
+def compare(results, baseline, threshold=0.1):
+    """与基线比较单次耗时的中位数（比平均值更不受偶发卡顿影响），
+    返回变慢超过threshold的 (场景, 函数, 当前速度/基线速度) 列表"""
+    regressions = []
+    for name, scenario in sorted(results['scenarios'].items()):
+        base_scenario = baseline['scenarios'].get(name)
+        if not base_scenario:
+            continue
+        for target, result in sorted(scenario['targets'].items()):
+            base = base_scenario['targets'].get(target)
+            if not base or not result['p50_us']:
+                continue
+            ratio = base['p50_us'] / result['p50_us']
+            if ratio < 1.0 - threshold:
+                regressions.append((name, target, ratio))
+    return regressions
+
+
+def main(argv=None):
+    """命令行入口：python benchmark.py [--scenarios=a,b] [--calls=N] [--alloc-calls=N] [--out=文件]
+    [--baseline=文件 [--threshold=0.1]] [--save-baseline=文件]"""
+    argv = sys.argv[1:] if argv is None else argv
+    options = dict(arg[2:].split('=', 1) for arg in argv if arg.startswith('--') and '=' in arg)
+    names = options['scenarios'].split(',') if 'scenarios' in options else None
+    results = run(names, calls=int(options.get('calls', 500)),
+                  alloc_calls=int(options.get('alloc-calls', 100)))
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if 'out' in options:
+        with open(options['out'], 'w') as out:
+            out.write(text + '\n')
+    else:
+        print(text)
+    if 'save-baseline' in options:
+        with open(options['save-baseline'], 'w') as out:
+            out.write(text + '\n')
+
+    if 'baseline' in options:
+        with open(options['baseline']) as f:
+            baseline = json.load(f)
+        threshold = float(options.get('threshold', 0.1))
+        regressions = compare(results, baseline, threshold)
+        for name, target, ratio in regressions:
+            print("变慢：{} {} 为基线的{:.0%}".format(name, target, ratio), file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
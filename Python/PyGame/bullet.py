@@ -25,14 +25,171 @@ class Bullet(Sprite): #Bullet 类继承了我们从模块pygame.sprite 中导入
 
         self.color = ai_settings.bullet_color 
         self.speed_factor = ai_settings.bullet_speed_factor
+        self.tick_dt = ai_settings.tick_dt # 每个逻辑帧的时长（秒）
+        # 这个逻辑帧扫过的矩形，碰撞检测用它代替rect，高速时也不会穿过外星人
+        self.swept = pygame.Rect(self.rect) if ai_settings.swept_collision else None
 
     def update(self):
         """向上移动子弹"""
+        top = self.rect.y
         #更新表示子弹位置的小数值
-        self.y -= self.speed_factor
+        self.y -= self.speed_factor * self.tick_dt
         #更新表示子弹的rect的位置
         self.rect.y = self.y
+        if self.swept is not None:
+            sweep(self.swept, self.rect, top)
 
     def draw_bullet(self):
         """在屏幕上绘制子弹"""         
-        pygame.draw.rect(self.screen, self.color, self.rect)         
\ No newline at end of file
+        pygame.draw.rect(self.screen, self.color, self.rect)         
+
+def sweep(swept, rect, top):
+    """把swept设为子弹从原来的顶端top移动到rect这一段扫过的矩形（子弹只向上移动）"""
+    swept.top = rect.top
+    swept.height = top - rect.top + rect.height
+
+class PooledBullet():
+    """子弹池里的一个槽位：只有固定的几个属性，发射时复用，不再每次新建精灵和Rect"""
+
+    __slots__ = ('pool', 'slot', 'screen', 'rect', 'y', 'color', 'speed_factor', 'tick_dt', 'active',
+                 'sweep_rect', 'swept')
+
+    def __init__(self, pool, slot):
+        """创建空槽位"""
+        self.pool = pool
+        self.slot = slot
+        self.screen = pool.screen
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.sweep_rect = pygame.Rect(0, 0, 0, 0) # 槽位自带的扫掠矩形，复用时不再新建
+        self.swept = None
+        self.y = 0.0
+        self.color = None
+        self.speed_factor = 0
+        self.tick_dt = 0
+        self.active = False
+
+    def reset(self, ai_settings, ship):
+        """在飞船所处的位置重新启用这颗子弹，与Bullet.__init__相同"""
+        rect = self.rect
+        rect.width = ai_settings.bullet_width
+        rect.height = ai_settings.bullet_height
+        rect.centerx = ship.rect.centerx
+        rect.top = ship.rect.top
+        self.y = float(rect.y)
+        self.color = ai_settings.bullet_color
+        self.speed_factor = ai_settings.bullet_speed_factor
+        self.tick_dt = ai_settings.tick_dt
+        if ai_settings.swept_collision:
+            self.sweep_rect.update(rect)
+            self.swept = self.sweep_rect
+        else:
+            self.swept = None
+        self.active = True
+
+    def update(self):
+        """向上移动子弹"""
+        top = self.rect.y
+        self.y -= self.speed_factor * self.tick_dt
+        self.rect.y = self.y
+        if self.swept is not None:
+            sweep(self.swept, self.rect, top)
+
+    def draw_bullet(self):
+        """在屏幕上绘制子弹"""
+        pygame.draw.rect(self.screen, self.color, self.rect)
+
+    def alive(self):
+        return self.active
+
+    def kill(self):
+        """与Sprite.kill相同：把子弹从池里移除（槽位回收）"""
+        if self.active:
+            self.pool.release(self)
+
+
+class BulletPool():
+    """预先分配的子弹池，接口与存放Bullet的Group相同（len、sprites、update、empty）"""
+
+    def __init__(self, ai_settings, screen, capacity=None):
+        """预先分配bullet_allowed个槽位"""
+        self.ai_settings = ai_settings
+        self.screen = screen
+        self.slots = []
+        self.free = [] # 空闲槽位（栈）
+        self.active = [] # 飞行中的子弹，按发射顺序
+        self.allocations = 0 # 创建过的槽位数
+        self.fired = 0 # 发射过的子弹数
+        self.culled = 0 # 飞出屏幕被回收的子弹数
+        self.peak = 0 # 同时飞行的最多子弹数
+        self.reserve(capacity or ai_settings.bullet_allowed)
+
+    def reserve(self, capacity):
+        """把池子扩充到至少capacity个槽位"""
+        while len(self.slots) < capacity:
+            bullet = PooledBullet(self, len(self.slots))
+            self.slots.append(bullet)
+            self.free.append(bullet)
+            self.allocations += 1
+
+    def fire(self, ship):
+        """从池中取出一颗子弹放到飞船位置；池子不够时扩充一个槽位（例如bullet_allowed调大后）"""
+        if not self.free:
+            self.reserve(len(self.slots) + 1)
+        bullet = self.free.pop()
+        bullet.reset(self.ai_settings, ship)
+        self.active.append(bullet)
+        self.fired += 1
+        if len(self.active) > self.peak:
+            self.peak = len(self.active)
+        return bullet
+
+    def release(self, bullet):
+        """回收一颗子弹"""
+        bullet.active = False
+        self.active.remove(bullet)
+        self.free.append(bullet)
+
+    def cull(self):
+        """一次遍历原地回收飞出屏幕顶端的子弹，不复制编组"""
+        active = self.active
+        free = self.free
+        kept = 0
+        for bullet in active:
+            if bullet.rect.bottom <= 0:
+                bullet.active = False
+                free.append(bullet)
+            else:
+                active[kept] = bullet
+                kept += 1
+        self.culled += len(active) - kept
+        del active[kept:]
+
+    def update(self):
+        """移动所有飞行中的子弹"""
+        for bullet in self.active:
+            bullet.update()
+
+    def sprites(self):
+        """返回飞行中子弹的列表（副本，遍历时可以kill）"""
+        return list(self.active)
+
+    def __iter__(self):
+        return iter(self.sprites())
+
+    def __len__(self):
+        return len(self.active)
+
+    def __bool__(self):
+        return bool(self.active)
+
+    def empty(self):
+        """回收所有子弹"""
+        for bullet in self.active:
+            bullet.active = False
+            self.free.append(bullet)
+        del self.active[:]
+
+    def stats(self):
+        """返回占用与分配统计"""
+        return {'capacity': len(self.slots), 'active': len(self.active), 'peak': self.peak,
+                'allocations': self.allocations, 'fired': self.fired, 'culled': self.culled}
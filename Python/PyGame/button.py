@@ -1,6 +1,7 @@
 
 
 import pygame.font
+import text_renderer
 
 class Button():
     def __init__(self, ai_settings, screen, msg):
@@ -12,7 +13,8 @@ class Button():
         self.width, self.height = 200, 50
         self.button_color = (0, 255, 0)
         self.text_color = (255, 255, 255) 
-        self.font = pygame.font.SysFont(None, 48) #设置字体 None 为默认字体，48为字号大小
+        self.text = text_renderer.get_renderer(None, 48) #设置字体 None 为默认字体，48为字号大小 与记分牌共享字形图集
+        self.font = self.text.font
 
         # 创建按钮的rect对象，并使其居中
         self.rect = pygame.Rect(0, 0, self.width, self.height) 
@@ -23,7 +25,7 @@ class Button():
 
     def prep_msg(self, msg):
         """将msg渲染为图像，并使其在键钮上居中"""        
-        self.msg_image = self.font.render(msg, True, self.text_color, self.button_color) 
+        self.msg_image = self.text.render(msg, self.text_color, self.button_color)
         self.msg_image_rect = self.msg_image.get_rect()
         self.msg_image_rect.center = self.rect.center
 
@@ -0,0 +1,232 @@
+# 时间：20261017
+# 功能：均匀网格（空间哈希）碰撞粗筛
+# pygame.sprite.groupcollide / spritecollideany 两两检测所有组合，开销随 子弹数×外星人数 增长；
+# 这里把精灵按矩形放进网格，只检测同格子里的精灵，返回结果与pygame完全一致；
+# 传入collided=collide_mask时，矩形相交的组合再按像素掩码精确判断；
+# 子弹带有swept矩形（这个逻辑帧扫过的整段路径）时，用它代替rect检测，高速子弹不会穿过外星人
+
+import pygame
+from pygame.sprite import Group
+
+
+class SpatialHash():
+    """均匀网格：格子坐标 -> 落在该格子里的精灵"""
+
+    def __init__(self, cell_size=120):
+        """初始化网格"""
+        self.cell_size = cell_size
+        self.cells = {} # (格x, 格y) -> 精灵集合
+        self.sprite_cells = {} # 精灵 -> 覆盖的格子范围 (x0, y0, x1, y1)
+        self.order = {} # 精灵 -> 插入顺序，用来还原编组的遍历顺序
+        self.counter = 0
+
+    def cell_range(self, rect):
+        """返回矩形覆盖的格子范围"""
+        size = self.cell_size
+        return (rect.left // size, rect.top // size,
+                max(rect.left, rect.right - 1) // size, max(rect.top, rect.bottom - 1) // size)
+
+    def _bucket(self, sprite, cell_range):
+        """把精灵放进范围内的所有格子"""
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell is None:
+                    cells[(cx, cy)] = cell = set()
+                cell.add(sprite)
+        self.sprite_cells[sprite] = cell_range
+
+    def _unbucket(self, sprite, cell_range):
+        """把精灵从范围内的所有格子中取出"""
+        x0, y0, x1, y1 = cell_range
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells[(cx, cy)]
+                cell.discard(sprite)
+                if not cell:
+                    del cells[(cx, cy)]
+
+    def insert(self, sprite):
+        """加入一个精灵"""
+        if sprite in self.sprite_cells:
+            self.move(sprite)
+            return
+        self.order[sprite] = self.counter
+        self.counter += 1
+        self._bucket(sprite, self.cell_range(sprite.rect))
+
+    def remove(self, sprite):
+        """移除一个精灵"""
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is not None:
+            self._unbucket(sprite, cell_range)
+            del self.order[sprite]
+
+    def move(self, sprite):
+        """精灵移动后更新所在格子；没有跨格子时什么也不做"""
+        old_range = self.sprite_cells[sprite]
+        new_range = self.cell_range(sprite.rect)
+        if new_range != old_range:
+            self._unbucket(sprite, old_range)
+            self._bucket(sprite, new_range)
+
+    def refresh(self):
+        """所有精灵移动后批量更新所在格子；只有跨格子的精灵才会重新入格"""
+        size = self.cell_size
+        moved = []
+        for sprite, old_range in self.sprite_cells.items():
+            rect = sprite.rect
+            left, top = rect.left, rect.top
+            new_range = (left // size, top // size,
+                         max(left, left + rect.width - 1) // size, max(top, top + rect.height - 1) // size)
+            if new_range != old_range:
+                moved.append((sprite, old_range, new_range))
+        for sprite, old_range, new_range in moved: # 遍历结束后再改字典
+            self._unbucket(sprite, old_range)
+            self._bucket(sprite, new_range)
+
+    def clear(self):
+        """清空网格"""
+        self.cells.clear()
+        self.sprite_cells.clear()
+        self.order.clear()
+
+    def query(self, rect):
+        """返回与矩形处于相同格子的候选精灵（还需要再做矩形检测）"""
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            return cells.get((x0, y0), ())
+        candidates = set()
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                cell = cells.get((cx, cy))
+                if cell:
+                    candidates.update(cell)
+        return candidates
+
+    def collide(self, rect):
+        """返回与矩形相交的精灵，顺序与加入顺序一致"""
+        hits = [sprite for sprite in self.query(rect) if rect.colliderect(sprite.rect)]
+        if len(hits) > 1:
+            hits.sort(key=self.order.__getitem__)
+        return hits
+
+
+class SpatialGroup(Group):
+    """自带空间哈希的精灵编组，加入、移除精灵时同步维护网格"""
+
+    def __init__(self, *sprites, **kwargs):
+        """初始化编组，参数顺序与Group相同，cell_size、min_pairs只能按关键字传入；
+        检测组合数少于min_pairs时直接用pygame的逐对检测，更快"""
+        self.grid = SpatialHash(kwargs.get('cell_size', 120)) # 要在Group.__init__添加精灵之前创建
+        self.min_pairs = kwargs.get('min_pairs', 10000)
+        super(SpatialGroup, self).__init__(*sprites)
+
+    def copy(self):
+        """复制编组，保留格子大小和min_pairs（Group.copy只传精灵）"""
+        return self.__class__(self.sprites(), cell_size=self.grid.cell_size, min_pairs=self.min_pairs)
+
+    def add_internal(self, sprite, *args):
+        super(SpatialGroup, self).add_internal(sprite, *args)
+        self.grid.insert(sprite)
+
+    def remove_internal(self, sprite):
+        super(SpatialGroup, self).remove_internal(sprite)
+        self.grid.remove(sprite)
+
+    def refresh(self):
+        """精灵移动后调用：只有跨格子的精灵才会重新入格"""
+        self.grid.refresh()
+
+    def collider(self, count):
+        """要检测count个精灵时返回网格碰撞函数；组合数太少时返回None，改用pygame逐对检测"""
+        if count * len(self.spritedict) < self.min_pairs:
+            return None
+        self.refresh()
+        return self.grid.collide
+
+
+solid_masks = {} # 尺寸 -> 全部置位的Mask，给没有掩码的精灵（子弹）使用
+
+
+def swept_rect(sprite):
+    """返回精灵这个逻辑帧扫过的矩形；没有记录扫掠矩形的精灵就是它的rect"""
+    swept = getattr(sprite, 'swept', None)
+    if swept is None:
+        return sprite.rect
+    return swept
+
+
+def sprite_mask(sprite, rect):
+    """返回精灵的像素掩码；没有mask属性的精灵视为填满整个rect"""
+    mask = getattr(sprite, 'mask', None)
+    if mask is None:
+        size = rect.size
+        mask = solid_masks.get(size)
+        if mask is None:
+            mask = solid_masks[size] = pygame.mask.Mask(size, fill=True)
+    return mask
+
+
+def masks_overlap(left, right):
+    """已知两个精灵的矩形相交，比较它们的像素掩码（left按扫掠矩形）"""
+    lrect, rrect = swept_rect(left), right.rect
+    offset = (lrect.left - rrect.left, lrect.top - rrect.top)
+    return sprite_mask(right, rrect).overlap(sprite_mask(left, lrect), offset) is not None
+
+
+def collide_swept(left, right):
+    """连续碰撞：left这个逻辑帧扫过的矩形与right的矩形相交（可用作pygame的collided参数）"""
+    return swept_rect(left).colliderect(right.rect)
+
+
+def collide_mask(left, right):
+    """像素级碰撞：先比较（扫掠）矩形，只有矩形相交时才比较掩码（可用作pygame的collided参数）"""
+    return swept_rect(left).colliderect(right.rect) and masks_overlap(left, right)
+
+
+def broadphase(group, count):
+    """返回编组自带的碰撞函数 collide(rect) -> 按加入顺序排列的命中精灵；没有则返回None"""
+    collider = getattr(group, 'collider', None) # SpatialGroup、numpy_fleet.FleetGroup
+    if collider is None:
+        return None
+    return collider(count)
+
+
+def groupcollide(groupa, groupb, dokilla, dokillb, collided=None):
+    """与pygame.sprite.groupcollide返回相同的字典；groupb自带粗筛时使用它"""
+    collide = broadphase(groupb, len(groupa))
+    if collide is None:
+        return pygame.sprite.groupcollide(groupa, groupb, dokilla, dokillb, collided)
+
+    crashed = {}
+    for sprite in groupa.sprites():
+        hits = collide(swept_rect(sprite)) # 粗筛返回的都是矩形相交的精灵，只剩精确判断
+        if hits and collided is collide_mask:
+            hits = [hit for hit in hits if masks_overlap(sprite, hit)]
+        elif hits and collided is not None and collided is not collide_swept:
+            hits = [hit for hit in hits if collided(sprite, hit)]
+        if hits:
+            if dokillb: # 先被击中的外星人立即移出网格，后面的子弹不会再命中它
+                for hit in hits:
+                    hit.kill()
+            crashed[sprite] = hits
+            if dokilla:
+                sprite.kill()
+    return crashed
+
+
+def spritecollideany(sprite, group, collided=None):
+    """与pygame.sprite.spritecollideany相同；group自带粗筛时使用它"""
+    collide = broadphase(group, 1)
+    if collide is None:
+        return pygame.sprite.spritecollideany(sprite, group, collided)
+
+    for hit in collide(swept_rect(sprite)):
+        if collided is None or collided(sprite, hit):
+            return hit
+    return None
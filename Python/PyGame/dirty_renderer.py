@@ -0,0 +1,107 @@
+# 时间：20261017
+# 功能：脏矩形渲染
+# update_screen每帧填充整屏并flip；这里只擦除、提交发生变化的区域，用pygame.display.update(rects)代替flip
+# 关卡切换、掉命、开始/结束游戏时退回整屏重绘
+
+import pygame
+import game_functions as gf
+
+
+class DirtyRenderer():
+    """只重绘、提交变化区域的渲染器"""
+
+    def __init__(self, ai_settings, screen, hud=None):
+        """初始化背景和上一帧的绘制记录；hud为HudOverlay时HUD作为一整块绘制"""
+        self.ai_settings = ai_settings
+        self.screen = screen
+        self.hud = hud
+        self.overlays = [] # 画在最上层的调试叠加层，提供overlay_item()，如profiler.FrameProfiler
+        self.background = pygame.Surface(screen.get_size()).convert()
+        self.background.fill(ai_settings.bg_color)
+        self.previous = {} # 上一帧绘制的内容：键 -> 屏幕矩形
+        self.full_redraw = True # 下一帧是否整屏重绘
+        self.state_key = None # 上一帧的 (等级, 剩余飞船, 游戏是否进行中)
+
+    def request_full_redraw(self):
+        """下一帧整屏重绘"""
+        self.full_redraw = True
+
+    def collect(self, stats, sb, ship, aliens, bullets, play_button):
+        """按渲染顺序列出本帧要绘制的内容：(键, 贴图或颜色, 矩形)"""
+        items = []
+        for bullet in bullets.sprites(): # 子弹在飞船和外星人后面
+            items.append((('bullet', bullet.color, tuple(bullet.rect)), bullet.color, bullet.rect))
+        items.append(((ship.image, tuple(ship.rect)), ship.image, ship.rect))
+        for alien in aliens.sprites():
+            items.append(((alien.image, tuple(alien.rect)), alien.image, alien.rect))
+        countdown = gf.respawn_countdown(self.ai_settings, stats, self.screen.get_rect())
+        if countdown: # 重生倒计时
+            image, rect = countdown
+            items.append(((image, tuple(rect)), image, rect))
+        if self.hud:
+            hud = self.hud
+            hud.recompose()
+            items.append((('hud', hud.version, tuple(hud.bounds)), hud.overlay, hud.bounds))
+        else:
+            for image, rect in ((sb.score_image, sb.score_rect),
+                                (sb.high_score_image, sb.high_score_rect),
+                                (sb.level_image, sb.level_rect)):
+                items.append(((image, tuple(rect)), image, rect))
+            for life in sb.ships.sprites():
+                items.append(((life.image, tuple(life.rect)), life.image, life.rect))
+            if not stats.game_active: # Play按钮放在最上层
+                button_color = play_button.button_color
+                items.append((('button', button_color, tuple(play_button.rect)), button_color, play_button.rect))
+                items.append(((play_button.msg_image, tuple(play_button.msg_image_rect)),
+                              play_button.msg_image, play_button.msg_image_rect))
+        for overlay in self.overlays:
+            item = overlay.overlay_item()
+            if item:
+                items.append(item)
+        return items
+
+    def draw_item(self, source, rect):
+        """绘制一项内容并返回屏幕上被改动的矩形"""
+        if source is getattr(self.hud, 'overlay', None): # HUD叠加层只取外接矩形部分
+            return self.screen.blit(source, rect, rect)
+        if isinstance(source, pygame.Surface):
+            return self.screen.blit(source, rect)
+        return pygame.draw.rect(self.screen, source, rect) # 与draw_bullet一致；fill对越出屏幕顶端的矩形裁剪方式不同
+
+    def update_screen(self, stats, sb, ship, aliens, bullets, play_button):
+        """绘制一帧，只提交变化过的区域"""
+        state_key = (stats.level, stats.ships_left, stats.game_active)
+        if state_key != self.state_key:
+            self.state_key = state_key
+            self.full_redraw = True
+
+        items = self.collect(stats, sb, ship, aliens, bullets, play_button)
+        current = {}
+
+        if self.full_redraw:
+            self.screen.blit(self.background, (0, 0))
+            for key, source, rect in items:
+                current[key] = self.draw_item(source, rect)
+            pygame.display.flip()
+            self.full_redraw = False
+            self.previous = current
+            return
+
+        # 擦除上一帧画过、本帧不再原样出现的内容
+        dirty = []
+        keys = set(key for key, source, rect in items)
+        for key, rect in self.previous.items():
+            if key not in keys:
+                dirty.append(self.screen.blit(self.background, rect, rect))
+
+        # 所有内容照常按顺序绘制（被擦除区域下面的静止物体也要补上），但只提交新出现的部分
+        previous = self.previous
+        for key, source, rect in items:
+            drawn = self.draw_item(source, rect)
+            current[key] = drawn
+            if key not in previous:
+                dirty.append(drawn)
+
+        if dirty:
+            pygame.display.update(dirty)
+        self.previous = current
@@ -0,0 +1,119 @@
+# 时间：20261017
+# 功能：外星人群生成
+# 每种 (屏幕尺寸, 飞船高度, 外星人尺寸) 的阵型只计算一次；下一波外星人在空闲时分批预先创建，
+# 过关或掉命时只需一次性加入编组，不再在同一帧里逐个创建
+
+from alien import Alien
+from assets import load_image
+
+
+def get_number_rows(ai_settings, ship_height, alien_height):
+    """计算屏幕可容纳多少行外星人"""
+    available_space_y = ai_settings.screen_height - (3 * alien_height) - ship_height # 用屏总高减去3个外星高度 减去飞船后的总宽
+    number_rows = int(available_space_y / (2 * alien_height))  # 用得到后的总高去 得到同比高度 隔一显一行的总行数
+    return number_rows
+
+def get_number_aliens_x(ai_settings, alien_width):
+    """计算每行可容纳多个少外星人"""
+    available_space_x = ai_settings.screen_width - 2 * alien_width # 用屏总宽减去两侧过后的总宽
+    number_aliens_x = int(available_space_x / (2 * alien_width)) # 用得到后的总宽去 得到同比宽度 隔一个显一个的总个数
+    return number_aliens_x
+
+
+class WaveSpawner():
+    """缓存阵型并预先创建下一波外星人"""
+
+    def __init__(self):
+        """初始化缓存"""
+        self.layouts = {} # 阵型键 -> 每个外星人的 (x, y)
+        self.ready = [] # 已经创建好的下一波外星人
+        self.ready_for = None # (ai_settings, screen, 阵型键)，预建的外星人只能用于同一组设置、屏幕和阵型
+        self.layout_hits = 0
+        self.layout_misses = 0
+        self.prebuilt = 0 # 空闲时预先创建的外星人数
+        self.built_on_spawn = 0 # 生成时才临时创建的外星人数
+
+    def layout(self, ai_settings, ship_height):
+        """返回 (阵型键, 位置列表)；同样的屏幕和贴图尺寸只计算一次"""
+        alien_width, alien_height = load_image('alien.bmp').get_size() # 不需要再创建一个外星人来测量
+        key = (ai_settings.screen_width, ai_settings.screen_height, ship_height, alien_width, alien_height)
+        positions = self.layouts.get(key)
+        if positions is None:
+            self.layout_misses += 1
+            number_aliens_x = get_number_aliens_x(ai_settings, alien_width)
+            number_rows = get_number_rows(ai_settings, ship_height, alien_height)
+            positions = tuple((alien_width + 2 * alien_width * alien_number, # 隔一个放一个
+                               alien_height + 2 * alien_height * row_number) # 隔一行放一行
+                              for row_number in range(number_rows)
+                              for alien_number in range(number_aliens_x))
+            self.layouts[key] = positions
+        else:
+            self.layout_hits += 1
+        return key, positions
+
+    def matches(self, ai_settings, screen, key):
+        """预建的外星人是否属于同一个设置对象、屏幕和阵型（阵型键每次新建，按值比较）"""
+        if self.ready_for is None:
+            return False
+        ready_settings, ready_screen, ready_key = self.ready_for
+        return ready_settings is ai_settings and ready_screen is screen and ready_key == key
+
+    def prebuild(self, ai_settings, screen, ship, budget=None):
+        """创建下一波外星人，最多创建budget个（None表示全部），返回下一波是否已准备好"""
+        key, positions = self.layout(ai_settings, ship.rect.height)
+        if not self.matches(ai_settings, screen, key):
+            self.ready = [] # 设置、屏幕或阵型变了，之前预建的外星人作废
+            self.ready_for = (ai_settings, screen, key)
+
+        built = 0
+        ready = self.ready
+        while len(ready) < len(positions):
+            if budget is not None and built >= budget:
+                return False
+            x, y = positions[len(ready)]
+            alien = Alien(ai_settings, screen)
+            alien.x = x
+            alien.rect.x = x
+            alien.rect.y = y
+            ready.append(alien)
+            built += 1
+        return True
+
+    def spawn(self, ai_settings, screen, ship, aliens):
+        """把下一波外星人一次性加入编组；还没预建完的部分当场补齐"""
+        key = self.layout(ai_settings, ship.rect.height)[0]
+        before = len(self.ready) if self.matches(ai_settings, screen, key) else 0 # 作废的预建不算
+        self.prebuild(ai_settings, screen, ship)
+        self.built_on_spawn += len(self.ready) - before
+        self.prebuilt += before
+        wave, self.ready = self.ready, []
+        aliens.add(*wave)
+
+    def stats(self):
+        """返回阵型缓存与预建统计"""
+        return {'layouts': len(self.layouts), 'layout_hits': self.layout_hits,
+                'layout_misses': self.layout_misses, 'prebuilt': self.prebuilt,
+                'built_on_spawn': self.built_on_spawn, 'ready': len(self.ready)}
+
+
+# 整个游戏共用一个生成器
+spawner = WaveSpawner()
+
+
+def check_prebuild(frames=20):
+    """自检：按每帧预算预建若干帧后，生成时不应再当场创建外星人；返回生成时创建的个数"""
+    import headless # 设置dummy驱动
+    game = headless.HeadlessGame()
+    ai_settings = game.ai_settings
+    checker = WaveSpawner()
+    for frame in range(frames):
+        checker.prebuild(ai_settings, game.screen, game.ship, ai_settings.fleet_prebuild_per_frame)
+    checker.spawn(ai_settings, game.screen, game.ship, game.aliens)
+    return checker.stats()['built_on_spawn']
+
+
+if __name__ == '__main__':
+    built = check_prebuild()
+    print("built on spawn after prebuild: {}".format(built))
+    if built:
+        raise SystemExit(1)
@@ -0,0 +1,41 @@
+# 时间：20261017
+# 功能：固定步长的游戏时钟
+# 逻辑按固定的tick_rate推进，渲染帧率由pygame.time.Clock限制；慢机器上通过累加器补帧，但补帧数有上限，避免越补越慢
+
+import pygame
+
+
+class GameClock():
+    """固定步长调度器：每个渲染帧告诉主循环需要执行几次逻辑帧"""
+
+    def __init__(self, ai_settings, fps=None):
+        """初始化时钟；fps为主循环的帧率上限，默认为max_fps"""
+        self.ai_settings = ai_settings
+        self.fps = fps
+        self.clock = pygame.time.Clock()
+        self.accumulator = 0.0 # 尚未消耗的真实时间（秒）
+        self.dropped_ticks = 0 # 因超过补帧上限而丢弃的逻辑帧数
+
+    def advance(self):
+        """等待到下一渲染帧，返回本帧应执行的逻辑帧数"""
+        tick_dt = self.ai_settings.tick_dt
+        elapsed = self.clock.tick(self.fps or self.ai_settings.max_fps) / 1000.0 # 限制渲染帧率，CPU不再空转
+        self.accumulator += elapsed
+
+        ticks = int(self.accumulator / tick_dt)
+        if ticks > self.ai_settings.max_catch_up_ticks:
+            # 卡顿太久（拖动窗口、断点调试等）时不追赶全部时间，只补有限帧
+            self.dropped_ticks += ticks - self.ai_settings.max_catch_up_ticks
+            ticks = self.ai_settings.max_catch_up_ticks
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * tick_dt
+        return ticks
+
+    def alpha(self):
+        """当前时刻在两个逻辑帧之间的比例（0~1），可用于渲染插值"""
+        return self.accumulator / self.ai_settings.tick_dt
+
+    def get_fps(self):
+        """返回实际渲染帧率"""
+        return self.clock.get_fps()
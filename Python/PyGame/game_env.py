@@ -0,0 +1,154 @@
+# 时间：20261017
+# 功能：Gym风格的游戏环境
+# AlienInvasionEnv用reset/step驱动无窗口游戏，把飞船位置、外星人位置、子弹和GameStats作为NumPy观测返回；
+# VectorEnv同时推进N局独立的游戏，不做渲染；需要像素观测时可以渲染到离屏Surface并取出数组
+
+import copy
+import os
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import numpy as np
+import pygame
+
+import headless
+from settings import Settings
+
+# 离散动作 -> HeadlessGame.step的输入
+ACTIONS = (
+    (), # 0 不动
+    (headless.LEFT,), # 1 左移
+    (headless.RIGHT,), # 2 右移
+    (headless.FIRE,), # 3 开火
+    (headless.LEFT, headless.FIRE), # 4 左移并开火
+    (headless.RIGHT, headless.FIRE), # 5 右移并开火
+)
+
+
+class AlienInvasionEnv():
+    """单局游戏的环境"""
+
+    def __init__(self, ai_settings=None, render_mode=None, max_aliens=128, max_bullets=None,
+                 max_steps=100000):
+        """初始化环境；render_mode为'rgb_array'时render()返回画面像素数组
+        传入的ai_settings不会被修改：环境使用它的副本（后端切换、游戏中的提速都只改副本）"""
+        self.ai_settings = copy.copy(ai_settings) if ai_settings else Settings()
+        if self.ai_settings.fleet_backend == 'sprite':
+            self.ai_settings.fleet_backend = 'numpy' # 观测直接从位置数组取，不逐个读取精灵
+        self.render_mode = render_mode
+        self.max_aliens = max_aliens
+        self.max_bullets = max_bullets or self.ai_settings.bullet_allowed
+        self.max_steps = max_steps
+        self.action_count = len(ACTIONS)
+        pygame.init()
+        if pygame.display.get_surface() is None: # 贴图convert()需要一个显示窗口（dummy驱动下不可见）
+            pygame.display.set_mode((1, 1))
+        self.screen = pygame.Surface((self.ai_settings.screen_width, self.ai_settings.screen_height))
+        self.game = None
+        self.steps = 0
+        self.score = 0
+
+    def reset(self, seed=None):
+        """开始新的一局，返回 (观测, 信息)"""
+        if seed is not None:
+            random.seed(seed)
+        self.game = headless.HeadlessGame(self.ai_settings, self.screen)
+        self.game.step((headless.PLAY,))
+        self.steps = 0
+        self.score = self.game.stats.score
+        return self.observe(), self.info()
+
+    def step(self, action):
+        """执行一个动作，返回 (观测, 奖励, 是否结束, 是否截断, 信息)；奖励为得分增量"""
+        self.game.step(ACTIONS[action])
+        self.steps += 1
+        stats = self.game.stats
+        reward = stats.score - self.score
+        self.score = stats.score
+        terminated = not stats.game_active
+        truncated = self.steps >= self.max_steps and not terminated
+        return self.observe(), reward, terminated, truncated, self.info()
+
+    def observe(self):
+        """把当前游戏状态转换为NumPy观测"""
+        game = self.game
+        stats = game.stats
+        aliens = np.zeros((self.max_aliens, 3), dtype=np.float32) # x, y, 是否存在
+        fleet = game.aliens
+        if hasattr(fleet, 'alive'): # NumPy外星人群：直接从位置数组取
+            index = np.flatnonzero(fleet.alive[:fleet.count])[:self.max_aliens]
+            aliens[:len(index), 0] = fleet.x[index]
+            aliens[:len(index), 1] = fleet.y[index]
+            aliens[:len(index), 2] = 1.0
+        else:
+            for i, alien in enumerate(fleet.sprites()[:self.max_aliens]):
+                aliens[i] = (alien.x, alien.rect.y, 1.0)
+        bullets = np.zeros((self.max_bullets, 3), dtype=np.float32)
+        for i, bullet in enumerate(game.bullets.sprites()[:self.max_bullets]):
+            bullets[i] = (bullet.rect.centerx, bullet.y, 1.0)
+        return {
+            'ship_x': np.array([game.ship.center], dtype=np.float32),
+            'aliens': aliens,
+            'bullets': bullets,
+            'stats': np.array([stats.score, stats.level, stats.ships_left, stats.game_active],
+                              dtype=np.float32),
+        }
+
+    def info(self):
+        return {'steps': self.steps, 'level': self.game.stats.level, 'aliens': len(self.game.aliens)}
+
+    def render(self):
+        """把当前画面画到离屏Surface上，返回 (高, 宽, 3) 的像素数组"""
+        if self.render_mode != 'rgb_array':
+            return None
+        game = self.game
+        self.screen.fill(self.ai_settings.bg_color)
+        for bullet in game.bullets.sprites():
+            bullet.draw_bullet()
+        game.ship.blitme()
+        game.aliens.draw(self.screen)
+        game.sb.show_score()
+        return pygame.surfarray.array3d(self.screen).transpose(1, 0, 2)
+
+    def close(self):
+        self.game = None
+
+
+class VectorEnv():
+    """同步推进N局独立游戏的环境；某局结束时自动开始新的一局"""
+
+    def __init__(self, count, ai_settings_factory=Settings, **kwargs):
+        """创建count个环境，每个环境有自己的Settings"""
+        self.envs = [AlienInvasionEnv(ai_settings_factory(), **kwargs) for i in range(count)]
+        self.count = count
+
+    def stack(self, observations):
+        """把每个环境的观测按键堆叠为 (N, ...) 数组"""
+        return dict((key, np.stack([obs[key] for obs in observations])) for key in observations[0])
+
+    def reset(self, seed=None):
+        """重置所有环境，返回堆叠后的观测和信息列表"""
+        results = [env.reset(None if seed is None else seed + i) for i, env in enumerate(self.envs)]
+        return self.stack([obs for obs, info in results]), [info for obs, info in results]
+
+    def step(self, actions):
+        """每个环境执行一个动作，返回堆叠后的 (观测, 奖励, 结束, 截断, 信息列表)"""
+        observations = []
+        rewards = np.zeros(self.count, dtype=np.float32)
+        terminated = np.zeros(self.count, dtype=bool)
+        truncated = np.zeros(self.count, dtype=bool)
+        infos = []
+        for i, (env, action) in enumerate(zip(self.envs, actions)):
+            obs, rewards[i], terminated[i], truncated[i], info = env.step(int(action))
+            if terminated[i] or truncated[i]:
+                info['final_observation'] = obs
+                obs, reset_info = env.reset()
+            observations.append(obs)
+            infos.append(info)
+        return self.stack(observations), rewards, terminated, truncated, infos
+
+    def close(self):
+        for env in self.envs:
+            env.close()
@@ -4,21 +4,42 @@
 
 import sys
 import pygame
-from bullet import Bullet
+from pygame.sprite import Group
+from bullet import Bullet, BulletPool
 from alien import Alien
-from time import sleep
+import collision
+import profiler
+import text_renderer
+from fleet_spawner import spawner, get_number_rows, get_number_aliens_x
+from telemetry import telemetry
 
-def get_number_rows(ai_settings, ship_height, alien_height):
-    """计算屏幕可容纳多少行外星人"""
-    available_space_y = ai_settings.screen_height - (3 * alien_height) - ship_height # 用屏总高减去3个外星高度 减去飞船后的总宽
-    number_rows = int(available_space_y / (2 * alien_height))  # 用得到后的总高去 得到同比高度 隔一显一行的总行数
-    return number_rows
+def memory_checkpoint(label, stats):
+    """开启内存跟踪时拍一个快照；只有开启时才会导入memory_tracker（连同tracemalloc），未开启时什么也不做"""
+    memory_tracker = sys.modules.get('memory_tracker')
+    if memory_tracker:
+        memory_tracker.checkpoint(label, stats)
 
-def get_number_aliens_x(ai_settings, alien_width):
-    """计算每行可容纳多个少外星人"""
-    available_space_x = ai_settings.screen_width - 2 * alien_width # 用屏总宽减去两侧过后的总宽
-    number_aliens_x = int(available_space_x / (2 * alien_width)) # 用得到后的总宽去 得到同比宽度 隔一个显一个的总个数
-    return number_aliens_x
+def create_alien_group(ai_settings):
+    """按设置创建存放外星人的编组"""
+    if ai_settings.fleet_backend == 'numpy':
+        from numpy_fleet import FleetGroup # numpy是可选依赖，用到时才导入
+        return FleetGroup(ai_settings=ai_settings)
+    return collision.SpatialGroup(cell_size=ai_settings.collision_cell_size,
+                                  min_pairs=ai_settings.collision_grid_pairs)
+
+def create_bullet_group(ai_settings, screen):
+    """按设置创建存放子弹的编组"""
+    if ai_settings.bullet_pooling:
+        return BulletPool(ai_settings, screen)
+    return Group()
+
+def narrowphase(ai_settings):
+    """按设置返回矩形相交后的精确碰撞判断；None表示只比较矩形"""
+    if ai_settings.pixel_collision:
+        return collision.collide_mask # 同样按子弹的扫掠矩形检测
+    if ai_settings.swept_collision:
+        return collision.collide_swept
+    return None
 
 def create_alien(ai_settings, screen, aliens, alien_number, row_number):
         """创建一个外星人并将其放在当前行"""
@@ -31,17 +52,12 @@ def create_alien(ai_settings, screen, aliens, alien_number, row_number):
 
 def create_fleet(ai_settings, screen, ship, aliens):
     """创建外星人群"""
-    # 创建一个外星人， 并计算一行可容纳多少个外星人
-    # 外星人间距为外星人宽度
-    alien = Alien(ai_settings, screen) # 需要知道资源宽高 先创建一个得到宽高
-    number_aliens_x = get_number_aliens_x(ai_settings, alien.rect.width)
-    number_rows = get_number_rows(ai_settings, ship.rect.height, alien.rect.height) #得到行数
-
-    """创建第一行外星人"""
-    for row_number in range(number_rows):
-        for alien_number in range(number_aliens_x):  #遍历总个数
-            # 创建一个外星人并将其加入当前行
-            create_alien(ai_settings, screen, aliens, alien_number, row_number)
+    # 阵型按屏幕和贴图尺寸缓存，外星人由主循环在空闲时预先创建（见fleet_spawner.py），这里一次性加入编组
+    spawner.spawn(ai_settings, screen, ship, aliens)
+
+def prepare_next_fleet(ai_settings, screen, ship):
+    """在帧的空闲时间分批预先创建下一波外星人"""
+    return spawner.prebuild(ai_settings, screen, ship, ai_settings.fleet_prebuild_per_frame)
 
 def check_keydown_events(event, ai_settings, screen, ship, bullets):
     """响应按键"""
@@ -54,11 +70,16 @@ def check_keydown_events(event, ai_settings, screen, ship, bullets):
         fire_bullet(ai_settings, screen, ship, bullets)
     elif event.key == pygame.K_q:
         sys.exit()     
+    elif event.key == pygame.K_F3: # 显示/隐藏帧耗时分析叠加层
+        profiler.toggle_overlay()
     
 def fire_bullet(ai_settings, screen, ship, bullets):
     """如果还没有到达限制，就发射一颗子弹"""
     #创建新子弹，并将其加入到编组bullets中
     if len(bullets) < ai_settings.bullet_allowed:
+        if hasattr(bullets, 'fire'): # 子弹池：复用空闲槽位
+            bullets.fire(ship)
+            return
         new_bullet = Bullet(ai_settings, screen, ship)
         bullets.add(new_bullet)            
 
@@ -69,9 +90,11 @@ def check_keyup_events(event, ship):
     elif event.key == pygame.K_LEFT or event.key == pygame.K_a: #方向左键监听
         ship.moving_left = False # 传递假       
 
-def check_events(ai_settings, screen, stats, sb, play_button, ship, aliens, bullets):
+def check_events(ai_settings, screen, stats, sb, play_button, ship, aliens, bullets, recorder=None):
     """响应按键和鼠标事件"""
     for event in pygame.event.get(): #次循环 监视键盘和鼠标事件
+        if recorder: # 录制输入，见replay.py
+            recorder.record(event)
         if event.type == pygame.QUIT:   #判断事件
             sys.exit()  #系统退出
         elif event.type == pygame.KEYDOWN: #按下
@@ -106,21 +129,25 @@ def check_play_button(ai_settings, screen, stats, sb, play_button, ship, aliens,
 
 def update_bullets(ai_settings, screen, stats, sb, ship, aliens, bullets):
     bullets.update() # 遍历子弹精灵图组 并自动更新
-    for bullet in bullets.copy(): # 副本中删除 删除已消失的子弹
-        if bullet.rect.bottom <= 0:  # 检查位置是否已到顶部外
-            bullets.remove(bullet)  # 将其从bullets中删除   
     # 检查是否有子弹击中了外星人
     # 如果是这样，就删除相应的子弹和外星人
+    # 先检测再回收：这个逻辑帧飞出屏幕的子弹，路径上仍可能击中外星人
     check_bullet_alien_collisions(ai_settings, screen, stats, sb, ship, aliens, bullets)
+    if hasattr(bullets, 'cull'): # 子弹池：一次遍历原地回收，不复制编组
+        bullets.cull()
+    else:
+        for bullet in bullets.copy(): # 副本中删除 删除已消失的子弹
+            if bullet.rect.bottom <= 0:  # 检查位置是否已到顶部外
+                bullets.remove(bullet)  # 将其从bullets中删除   
 
 def check_bullet_alien_collisions(ai_settings, screen, stats, sb, ship, aliens, bullets):
     """响应子弹和外星人的碰撞"""
     # 删除发生碰撞的子弹和外星人
-    collisions = pygame.sprite.groupcollide(bullets, aliens, True, True) #字典中添加键－值 碰撞检测 消除资源
+    collisions = collision.groupcollide(bullets, aliens, True, True, narrowphase(ai_settings)) #字典中添加键－值 碰撞检测 消除资源 （网格粗筛，结果与pygame相同）
     if collisions:
         for aliens in collisions.values():
             stats.score += ai_settings.alien_points * len(aliens)
-            sb.prep_score()
+        sb.prep_score() # 所有命中计分后只渲染一次
         check_high_score(stats, sb)
 
     if len(aliens) == 0:
@@ -133,8 +160,15 @@ def check_bullet_alien_collisions(ai_settings, screen, stats, sb, ship, aliens,
         sb.prep_level()
 
         create_fleet(ai_settings, screen, ship, aliens) 
+        memory_checkpoint('level', stats) # 开启内存跟踪时比较上一关以来的内存增长
     
-def update_screen(ai_settings, screen, stats, sb, ship, alien, bullets, play_button):
+def show_play_screen(ai_settings, screen, play_button):
+    """启动时立即显示只有背景和Play按钮的画面，其余对象在这之后再创建"""
+    screen.fill(ai_settings.bg_color)
+    play_button.draw_button()
+    pygame.display.flip()
+
+def update_screen(ai_settings, screen, stats, sb, ship, alien, bullets, play_button, hud=None):
     """更新屏幕上的图像，并切换到新屏幕"""    
     # 每次循环时都重绘屏幕
     screen.fill(ai_settings.bg_color) # 每次循环时都重绘屏幕 # 1、设置背景色
@@ -143,13 +177,23 @@ def update_screen(ai_settings, screen, stats, sb, ship, alien, bullets, play_but
         bullet.draw_bullet()
     ship.blitme() #渲染队列应该在背景前面,注意前后顺序 2、渲染物件 
     alien.draw(screen) #让外星人出现在屏幕布上
-    sb.show_score() #显示得分
-    if not stats.game_active: #如果游戏处于非活动状态， 就绘制Play按钮，注意渲染顺序，要放在最上层，最后渲染出来
-        play_button.draw_button()
+    countdown = respawn_countdown(ai_settings, stats, screen.get_rect()) #飞船被撞后的重生倒计时
+    if countdown:
+        screen.blit(*countdown)
+    if hud: # 缓存的HUD叠加层：得分、飞船、Play按钮一次blit
+        hud.draw()
+    else:
+        sb.show_score() #显示得分
+        if not stats.game_active: #如果游戏处于非活动状态， 就绘制Play按钮，注意渲染顺序，要放在最上层，最后渲染出来
+            play_button.draw_button()
     pygame.display.flip() # 让最近绘制的屏幕可见   3、帧刷新     
 
 def check_fleet_edges(ai_settings, aliens):
     """有外星人到达边缘时采取相应的措施"""
+    if hasattr(aliens, 'check_edges'): # NumPy外星人群，整批检测
+        if aliens.check_edges():
+            change_fleet_direction(ai_settings, aliens)
+        return
     for alien in aliens.sprites():
         if alien.check_edges():
             change_fleet_direction(ai_settings, aliens)
@@ -157,8 +201,11 @@ def check_fleet_edges(ai_settings, aliens):
 
 def change_fleet_direction(ai_settings, aliens):
     """将整群外星人下移，并改变它们的方向"""
-    for alien in aliens.sprites():
-         alien.rect.y += ai_settings.fleet_drop_speed
+    if hasattr(aliens, 'drop'): # NumPy外星人群，整批下移
+        aliens.drop(ai_settings.fleet_drop_speed)
+    else:
+        for alien in aliens.sprites():
+            alien.rect.y += ai_settings.fleet_drop_speed
     ai_settings.fleet_direction *= -1    
 
 def ship_hit(ai_settings, screen, stats, sb, ship, aliens, bullets):
@@ -174,20 +221,43 @@ def ship_hit(ai_settings, screen, stats, sb, ship, aliens, bullets):
         # 创建一群新的外星人，并将飞船放到屏幕底端中央
         create_fleet(ai_settings, screen, ship, aliens)
         ship.center_ship()    
-        # 暂停
-        sleep(0.5)  
+        # 暂停：不再sleep阻塞主循环，而是进入按逻辑帧倒计时的重生状态，期间照常处理事件和渲染
+        stats.respawn_ticks = int(round(ai_settings.ship_hit_pause * ai_settings.tick_rate))
     else:
         stats.game_active = False  
         pygame.mouse.set_visible(True) 
+    memory_checkpoint('ship_hit', stats)
+
+def update_respawn(stats):
+    """重生暂停中时倒计时一个逻辑帧并返回True，这一帧不推进游戏逻辑"""
+    if stats.respawn_ticks > 0:
+        stats.respawn_ticks -= 1
+        return True
+    return False
+
+def respawn_countdown(ai_settings, stats, screen_rect):
+    """重生暂停中时返回倒计时文字的 (图像, 矩形)，否则返回None"""
+    if stats.respawn_ticks <= 0 or not stats.game_active:
+        return None
+    seconds = stats.respawn_ticks * ai_settings.tick_dt
+    image = text_renderer.get_renderer(None, 48).render("{:.1f}".format(seconds), (30, 30, 30), ai_settings.bg_color)
+    rect = image.get_rect()
+    rect.center = screen_rect.center
+    return image, rect
 
 def check_aliens_bottom(ai_settings, screen, stats, sb, ship, aliens, bullets):
     """检查是否有外星人到达了屏幕底端"""
     screen_rect = screen.get_rect()
+    if hasattr(aliens, 'reached_bottom'): # NumPy外星人群，整批检测
+        if aliens.reached_bottom(screen_rect.bottom):
+            ship_hit(ai_settings, screen, stats, sb, ship, aliens, bullets)
+            telemetry.event('ship_hit', cause='bottom', ships_left=stats.ships_left)
+        return
     for alien in aliens.sprites():
         if alien.rect.bottom >= screen_rect.bottom:
             # 像飞船被撞到一样的进行处理
             ship_hit(ai_settings, screen, stats, sb, ship, aliens, bullets)
-            print("Ship hit!!!") 
+            telemetry.event('ship_hit', cause='bottom', ships_left=stats.ships_left)
             break    
 
 def update_aliens(ai_settings, screen, stats, sb, ship, aliens, bullets):
@@ -198,8 +268,9 @@ def update_aliens(ai_settings, screen, stats, sb, ship, aliens, bullets):
     aliens.update()
 
     # 检测外星人和飞船之间的碰撞
-    if pygame.sprite.spritecollideany(ship, aliens):
+    if collision.spritecollideany(ship, aliens, narrowphase(ai_settings)):
         ship_hit(ai_settings, screen, stats, sb, ship, aliens, bullets)
+        telemetry.event('ship_hit', cause='collision', ships_left=stats.ships_left)
 
     # 检查是否有外星人到达屏幕底端
     check_aliens_bottom(ai_settings, screen, stats, sb, ship, aliens, bullets)
@@ -1,8 +1,12 @@
 class GameStats():
     """跟踪游戏的统计信息"""
 
+    # 这些统计信息每次变化时版本号加1，HUD据此只重绘变化的部分
+    TRACKED = ('score', 'high_score', 'level', 'ships_left', 'game_active')
+
     def __init__(self, ai_settings):
         """初如化统计信息"""
+        self.versions = dict((name, 0) for name in self.TRACKED)
         self.ai_settings = ai_settings
         self.reset_stats()
         self.game_active = False # 游戏刚启动时处于非活动状态
@@ -12,6 +16,12 @@ class GameStats():
     def reset_stats(self):
         """初始化在游戏运行期间可能变化的统计信息"""
         self.ships_left = self.ai_settings.ship_limit
+        self.respawn_ticks = 0 # 飞船被撞后剩余的暂停逻辑帧数
         self.score = 0
         self.level = 1
-        
+
+    def __setattr__(self, name, value):
+        """统计信息的值发生变化时更新版本号"""
+        if name in self.TRACKED and self.__dict__.get(name) != value:
+            self.versions[name] += 1
+        self.__dict__[name] = value
@@ -0,0 +1,86 @@
+# 时间：20261017
+# 功能：垃圾回收策略
+# 启动完成后gc.freeze()把长期存活的对象（贴图、字形、设置、编组…）移出回收范围；关卡进行中关闭或限制自动回收，
+# 在过关、掉命、开始/结束游戏的那一帧显式回收，避免回收暂停随机落在关卡中间；每次回收的代和耗时经gc.callbacks记录
+# gc_mode为'default'时不冻结、不显式回收、不改阈值，只统计回收，用来与其他策略对比
+
+import gc
+import time
+
+
+class GcPolicy():
+    """按关卡状态切换垃圾回收方式，并统计每次回收的暂停时间"""
+
+    def __init__(self, ai_settings, profiler=None):
+        """初始化策略并注册回收回调；profiler为FrameProfiler时回收耗时记入其'gc'和'gc0'~'gc2'统计"""
+        self.mode = ai_settings.gc_mode
+        self.level_threshold = ai_settings.gc_level_threshold
+        self.profiler = profiler
+        self.default_threshold = gc.get_threshold()
+        self.collections = [0, 0, 0] # 每一代的回收次数
+        self.total_time = 0.0 # 回收总耗时（秒）
+        self.max_pause = 0.0 # 最长的一次回收（秒）
+        self.started = None # 正在进行的回收的开始时间
+        self.state_key = None # 上一帧的 (等级, 剩余飞船, 游戏是否进行中) 版本号
+        self.in_level = False # 当前是否按关卡进行中的方式回收
+        gc.callbacks.append(self.on_gc)
+
+    def on_gc(self, phase, info):
+        """gc.callbacks回调：记录每次回收的代和耗时"""
+        if phase == 'start':
+            self.started = time.perf_counter()
+            return
+        if self.started is None:
+            return
+        seconds = time.perf_counter() - self.started
+        self.started = None
+        self.collections[info['generation']] += 1
+        self.total_time += seconds
+        if seconds > self.max_pause:
+            self.max_pause = seconds
+        if self.profiler:
+            self.profiler.record('gc', seconds)
+            self.profiler.record('gc{}'.format(info['generation']), seconds)
+
+    def freeze(self):
+        """启动完成后调用：回收一次，再把所有存活对象冻结（gc.freeze需要Python 3.7+）"""
+        if self.mode == 'default':
+            return
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    def update(self, stats):
+        """每帧调用一次：状态切换时显式回收，并按是否在关卡中切换自动回收方式"""
+        if self.mode == 'default':
+            return
+        versions = stats.versions
+        key = (versions['level'], versions['ships_left'], versions['game_active'])
+        if key != self.state_key: # 过关、掉命、开始或结束游戏：画面本来就在切换
+            self.state_key = key
+            gc.collect()
+        self.set_in_level(stats.game_active and stats.respawn_ticks == 0)
+
+    def set_in_level(self, in_level):
+        """关卡进行中按gc_mode关闭或限制自动回收；菜单和重生暂停时恢复默认"""
+        if in_level == self.in_level:
+            return
+        self.in_level = in_level
+        if not in_level:
+            gc.set_threshold(*self.default_threshold)
+            gc.enable()
+        elif self.mode == 'disabled':
+            gc.disable()
+        else: # 'limited'：只推迟第0代回收，积累更多对象再回收，次数大大减少
+            gc.set_threshold(self.level_threshold, *self.default_threshold[1:])
+
+    def close(self):
+        """恢复默认的回收设置并注销回调"""
+        self.set_in_level(False)
+        if self.on_gc in gc.callbacks:
+            gc.callbacks.remove(self.on_gc)
+
+    def stats(self):
+        """返回回收次数与暂停统计（毫秒）"""
+        return {'collections': list(self.collections), 'total_ms': self.total_time * 1000.0,
+                'max_pause_ms': self.max_pause * 1000.0}
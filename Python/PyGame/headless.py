@@ -0,0 +1,140 @@
+# 时间：20261017
+# 功能：无窗口、不限帧的模拟模式
+# 在SDL的dummy驱动下逐帧推进与run_game相同的游戏逻辑，不做任何渲染，用于CI上的浸泡测试和逐帧耗时测量
+
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') # 必须在pygame初始化显示之前设置
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from settings import Settings
+from ship import Ship
+from game_stats import GameStats
+from button import Button
+from scoreboard import Scoreboard
+import game_functions as gf
+
+# step()可以接受的输入
+LEFT = 'left'
+RIGHT = 'right'
+FIRE = 'fire'
+PLAY = 'play'
+
+
+class HeadlessGame():
+    """不渲染的游戏引擎，按帧推进游戏逻辑"""
+
+    def __init__(self, ai_settings=None, screen=None):
+        """初始化游戏对象，与run_game中创建的对象一致；screen可以是离屏Surface，多局游戏各用各的
+        传入的ai_settings原样使用，不做修改（回放、批量模拟在外面还要用同一个对象）"""
+        pygame.init()
+        self.ai_settings = ai_settings or Settings()
+        if screen is None:
+            screen = pygame.display.set_mode((self.ai_settings.screen_width,
+                                              self.ai_settings.screen_height))
+        self.screen = screen
+        self.play_button = Button(self.ai_settings, self.screen, "Play")
+        self.stats = GameStats(self.ai_settings)
+        self.sb = Scoreboard(self.ai_settings, self.screen, self.stats)
+        self.ship = Ship(self.ai_settings, self.screen)
+        self.bullets = gf.create_bullet_group(self.ai_settings, self.screen)
+        self.aliens = gf.create_alien_group(self.ai_settings)
+        gf.create_fleet(self.ai_settings, self.screen, self.ship, self.aliens)
+        self.ticks = 0
+
+    def apply_inputs(self, inputs):
+        """把一帧的输入转换为与check_events相同的处理"""
+        self.ship.moving_left = LEFT in inputs
+        self.ship.moving_right = RIGHT in inputs
+        if PLAY in inputs:
+            mouse_x, mouse_y = self.play_button.rect.center
+            gf.check_play_button(self.ai_settings, self.screen, self.stats, self.sb,
+                                 self.play_button, self.ship, self.aliens, self.bullets,
+                                 mouse_x, mouse_y)
+        if FIRE in inputs and self.stats.game_active:
+            gf.fire_bullet(self.ai_settings, self.screen, self.ship, self.bullets)
+
+    def step(self, inputs=()):
+        """推进一帧并返回当前状态；inputs为本帧按下的输入集合，如(RIGHT, FIRE)"""
+        pygame.event.pump() # 不处理窗口事件，但仍让SDL清空事件队列
+        self.apply_inputs(inputs)
+        self.update_logic()
+        self.ticks += 1
+        return self.state()
+
+    def update_logic(self):
+        """游戏进行中时推进一个逻辑帧，与run_game主循环中的一次逻辑更新相同；返回是否推进了"""
+        if not self.stats.game_active:
+            return False
+        self.stats.respawn_ticks = 0 # 模拟时跳过飞船被撞后的重生暂停，不需要等待
+        self.ship.update()
+        gf.update_bullets(self.ai_settings, self.screen, self.stats, self.sb,
+                          self.ship, self.aliens, self.bullets)
+        gf.update_aliens(self.ai_settings, self.screen, self.stats, self.sb,
+                         self.ship, self.aliens, self.bullets)
+        return True
+
+    def state(self):
+        """返回当前游戏状态"""
+        return {
+            'tick': self.ticks,
+            'game_active': self.stats.game_active,
+            'score': self.stats.score,
+            'high_score': self.stats.high_score,
+            'level': self.stats.level,
+            'ships_left': self.stats.ships_left,
+            'ship_x': self.ship.center,
+            'aliens': len(self.aliens),
+            'bullets': len(self.bullets),
+        }
+
+
+def default_policy(state):
+    """简单的脚本策略：左右来回移动并持续开火"""
+    if (state['tick'] // 120) % 2:
+        return (LEFT, FIRE)
+    return (RIGHT, FIRE)
+
+
+def run_until_game_over(game=None, policy=default_policy, max_ticks=None):
+    """开始一局游戏并一直推进到游戏结束（或达到max_ticks），返回最终状态和耗时"""
+    game = game or HeadlessGame()
+    state = game.step((PLAY,))
+    start = time.perf_counter()
+    ticks = 0
+    while state['game_active']:
+        if max_ticks is not None and ticks >= max_ticks:
+            break
+        state = game.step(policy(state))
+        ticks += 1
+    elapsed = time.perf_counter() - start
+    return state, ticks, elapsed
+
+
+def main(argv=None):
+    """命令行入口：python headless.py [最大帧数] [--memory-report=文件]"""
+    argv = sys.argv[1:] if argv is None else argv
+    options = dict(arg[2:].split('=', 1) for arg in argv if arg.startswith('--') and '=' in arg)
+    positional = [arg for arg in argv if not arg.startswith('--')]
+    max_ticks = int(positional[0]) if positional else None
+    game = HeadlessGame()
+    tracker = None
+    if 'memory-report' in options: # 浸泡测试时确认内存不会持续增长
+        from memory_tracker import MemoryTracker
+        game.ai_settings.memory_report = options['memory-report']
+        tracker = MemoryTracker(game.ai_settings, lambda: (game.ship, game.aliens, game.bullets, game.sb.ships))
+    try:
+        state, ticks, elapsed = run_until_game_over(game, max_ticks=max_ticks)
+    finally:
+        if tracker:
+            tracker.close()
+    rate = ticks / elapsed if elapsed > 0 else 0.0
+    print("ticks: {}  seconds: {:.3f}  ticks/sec: {:,.0f}".format(ticks, elapsed, rate))
+    print(state)
+
+
+if __name__ == '__main__':
+    main()
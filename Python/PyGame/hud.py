@@ -0,0 +1,90 @@
+# 时间：20261017
+# 功能：HUD叠加层
+# 得分、最高分、等级、剩余飞船和Play按钮只有在GameStats变化时才会改变；
+# 把它们合成到一张缓存的叠加层上，根据GameStats的版本号只重绘变化的部分，每帧只需要一次blit
+
+import pygame
+
+COLORKEY = (255, 0, 255) # 叠加层的透明色
+
+# HUD的各个部分，按绘制顺序排列（Play按钮在最上层），以及决定它们内容的统计信息
+PARTS = ('score', 'high_score', 'level', 'ships', 'button')
+PART_STATS = {
+    'score': 'score',
+    'high_score': 'high_score',
+    'level': 'level',
+    'ships': 'ships_left',
+    'button': 'game_active',
+}
+
+
+class HudOverlay():
+    """缓存HUD的叠加层"""
+
+    def __init__(self, ai_settings, screen, stats, sb, play_button):
+        """初始化叠加层"""
+        self.screen = screen
+        self.stats = stats
+        self.sb = sb
+        self.play_button = play_button
+        self.overlay = pygame.Surface(screen.get_size()).convert()
+        self.overlay.set_colorkey(COLORKEY, pygame.RLEACCEL) # 透明区域用RLE编码，blit时直接跳过
+        self.overlay.fill(COLORKEY)
+        self.seen = {} # 部分 -> 上次合成时的统计版本号
+        self.rects = {} # 部分 -> 在叠加层上占用的矩形
+        self.bounds = pygame.Rect(0, 0, 0, 0) # 所有部分的外接矩形
+        self.version = 0 # 叠加层每重新合成一次加1
+        self.recompositions = 0
+
+    def part_images(self, part):
+        """返回一个部分要绘制的 (图像, 矩形) 列表"""
+        sb = self.sb
+        if part == 'score':
+            return [(sb.score_image, sb.score_rect)]
+        if part == 'high_score':
+            return [(sb.high_score_image, sb.high_score_rect)]
+        if part == 'level':
+            return [(sb.level_image, sb.level_rect)]
+        if part == 'ships':
+            return [(ship.image, ship.rect) for ship in sb.ships.sprites()]
+        if not self.stats.game_active: # 'button'
+            button = self.play_button
+            return [(button.button_color, button.rect), (button.msg_image, button.msg_image_rect)]
+        return []
+
+    def recompose(self):
+        """重绘统计信息变化过的部分，返回叠加层是否改变"""
+        versions = self.stats.versions
+        changed = set(part for part in PARTS if self.seen.get(part) != versions[PART_STATS[part]])
+        if not changed:
+            return False
+
+        # 擦掉变化部分的旧内容；与擦除、重画区域重叠的其他部分也要按顺序补画
+        touched = [self.overlay.fill(COLORKEY, self.rects[part]) for part in changed if part in self.rects]
+        for part in PARTS:
+            rect = self.rects.get(part)
+            if part in changed or (rect and rect.collidelist(touched) != -1):
+                touched.append(self.draw_part(part))
+            self.seen[part] = versions[PART_STATS[part]]
+
+        rects = [rect for rect in self.rects.values() if rect.width and rect.height]
+        self.bounds = rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0)
+        self.version += 1
+        self.recompositions += 1
+        return True
+
+    def draw_part(self, part):
+        """把一个部分画到叠加层上并记录它占用的矩形"""
+        drawn = []
+        for source, rect in self.part_images(part):
+            if isinstance(source, pygame.Surface):
+                drawn.append(self.overlay.blit(source, rect))
+            else:
+                drawn.append(self.overlay.fill(source, rect))
+        self.rects[part] = drawn[0].unionall(drawn[1:]) if drawn else pygame.Rect(0, 0, 0, 0)
+        return self.rects[part]
+
+    def draw(self):
+        """把HUD绘制到屏幕上（一次blit），返回屏幕上被改动的矩形"""
+        self.recompose()
+        return self.screen.blit(self.overlay, self.bounds, self.bounds)
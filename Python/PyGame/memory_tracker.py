@@ -0,0 +1,112 @@
+# 时间：20261017
+# 功能：按关卡统计内存增长
+# 可选开启：用tracemalloc在每次过关、飞船被撞时拍快照，与上一个快照按源代码行比较，
+# 把增长最多的位置和各精灵类的存活对象数写入报告，用来确认长时间运行时内存不会持续增长；
+# 只读取内存和游戏对象，不调用gc.collect/freeze/unfreeze，不改变被测程序的回收状态
+
+import gc
+import time
+import tracemalloc
+from collections import Counter
+
+from pygame.sprite import Sprite
+from bullet import PooledBullet
+from fleet_spawner import spawner
+
+active_tracker = None # 当前的跟踪器，gf在过关和ship_hit时通过checkpoint()使用
+
+# 不统计tracemalloc自身和导入机制的分配
+FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def frozen_count():
+    """gc.freeze()冻结的对象数（Python 3.7以前没有冻结，返回0）"""
+    if hasattr(gc, 'get_freeze_count'):
+        return gc.get_freeze_count()
+    return 0
+
+
+def live_sprites(sources=()):
+    """返回游戏持有的各精灵类对象数：遍历sources里的精灵、编组和子弹池，以及预建的下一波外星人
+    不用gc.get_objects()：它不包括冻结的对象，为统计而解冻再冻结又会改变回收状态"""
+    seen = set()
+    counts = Counter()
+    for source in tuple(sources) + (spawner.ready,):
+        if isinstance(source, (Sprite, PooledBullet)):
+            items = (source,)
+        elif hasattr(source, 'slots'): # BulletPool：空闲槽位里的子弹也一直存活
+            items = source.slots
+        elif hasattr(source, 'sprites'):
+            items = source.sprites()
+        else:
+            items = source
+        for item in items:
+            if id(item) not in seen:
+                seen.add(id(item))
+                counts[type(item).__name__] += 1
+    return counts
+
+
+class MemoryTracker():
+    """在关卡切换时拍tracemalloc快照，并把增长最多的源代码行写入报告"""
+
+    def __init__(self, ai_settings, sources=None):
+        """开始跟踪内存分配并打开报告文件；sources为返回要统计的精灵、编组（如飞船、外星人、子弹）的函数"""
+        global active_tracker
+        active_tracker = self
+        self.sources = sources or tuple
+        self.top = ai_settings.memory_top
+        self.report = open(ai_settings.memory_report, 'w')
+        self.previous = None
+        self.checkpoints = 0
+        self.started = time.perf_counter()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(ai_settings.memory_frames)
+        self.checkpoint('start', None)
+
+    def checkpoint(self, label, stats):
+        """拍一个快照，写出与上一个快照相比增长最多的源代码行和存活精灵数"""
+        snapshot = tracemalloc.take_snapshot().filter_traces(FILTERS)
+        current, peak = tracemalloc.get_traced_memory()
+        self.checkpoints += 1
+        write = self.report.write
+        write("== #{} {} {:.1f}s".format(self.checkpoints, label, time.perf_counter() - self.started))
+        if stats is not None:
+            write(" level={} ships_left={} score={}".format(stats.level, stats.ships_left, stats.score))
+        write("\ntraced: {:.1f} KiB  peak: {:.1f} KiB\n".format(current / 1024.0, peak / 1024.0))
+
+        if self.previous is not None:
+            diffs = [diff for diff in snapshot.compare_to(self.previous, 'lineno') if diff.size_diff > 0]
+            for diff in diffs[:self.top]: # compare_to已按增长量从大到小排序
+                frame = diff.traceback[0]
+                write("  {:+9.1f} KiB {:+7d} blocks  {}:{}\n".format(
+                    diff.size_diff / 1024.0, diff.count_diff, frame.filename, frame.lineno))
+        counts = live_sprites(self.sources())
+        write("  live: {}\n".format(', '.join('{}={}'.format(name, counts[name]) for name in sorted(counts))))
+        write("  frozen: {}\n".format(frozen_count()))
+        self.report.flush()
+        self.previous = snapshot
+
+    def close(self):
+        """写最后一个快照，停止跟踪并关闭报告"""
+        global active_tracker
+        if self.report is None:
+            return
+        self.checkpoint('exit', None)
+        self.report.close()
+        self.report = None
+        self.previous = None
+        tracemalloc.stop()
+        if active_tracker is self:
+            active_tracker = None
+
+
+def checkpoint(label, stats):
+    """开启了内存跟踪时拍一个快照；未开启时什么也不做"""
+    if active_tracker:
+        active_tracker.checkpoint(label, stats)
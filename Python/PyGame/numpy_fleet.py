@@ -0,0 +1,173 @@
+# 时间：20261017
+# 功能：NumPy外星人群（可选）
+# 外星人的位置保存在NumPy数组里，移动、下移、触边和触底检测都是整批数组运算；
+# Alien精灵只作为绘制和碰撞的视图，在有代码读取精灵时才把数组里的坐标写回rect
+
+from pygame.sprite import Group
+
+try:
+    import numpy as np
+except ImportError: # 没有安装numpy时不能使用这个后端，Settings.fleet_backend保持'sprite'即可
+    np = None
+
+
+def rect_coords(values):
+    """把小数坐标转换为整数，规则与给pygame.Rect赋小数值时相同（四舍五入，.5远离0）"""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class FleetGroup(Group):
+    """位置保存在数组中的外星人编组"""
+
+    def __init__(self, *sprites, **kwargs):
+        """初始化编组和位置数组；参数顺序与Group相同，ai_settings（必需）、capacity只能按关键字传入"""
+        if np is None:
+            raise ImportError("FleetGroup需要numpy：pip install numpy")
+        self.ai_settings = kwargs['ai_settings']
+        capacity = kwargs.get('capacity', 64)
+        self.x = np.zeros(capacity) # 精确的x坐标（小数）
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.width = np.zeros(capacity, dtype=np.int64)
+        self.height = np.zeros(capacity, dtype=np.int64)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.views = [] # 下标 -> 精灵
+        self.index = {} # 精灵 -> 下标
+        self.count = 0
+        self.dirty = False # 数组是否有尚未写回rect的改动
+        self.boxes = None # collide()用的 (左, 右, 上, 下) 整数数组，位置改变后重新计算
+        super(FleetGroup, self).__init__(*sprites)
+
+    def copy(self):
+        """复制编组，保留设置和数组容量（Group.copy只传精灵）"""
+        return self.__class__(self.sprites(), ai_settings=self.ai_settings, capacity=len(self.x))
+
+    def grow(self):
+        """数组容量翻倍"""
+        capacity = len(self.x) * 2
+        for name in ('x', 'y', 'width', 'height', 'alive'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add_internal(self, sprite, *args):
+        """把精灵的当前位置写入数组"""
+        super(FleetGroup, self).add_internal(sprite, *args)
+        if self.count == len(self.x):
+            self.grow()
+        i = self.count
+        self.x[i] = getattr(sprite, 'x', sprite.rect.x)
+        self.y[i] = sprite.rect.y
+        self.width[i] = sprite.rect.width
+        self.height[i] = sprite.rect.height
+        self.alive[i] = True
+        self.views.append(sprite)
+        self.index[sprite] = i
+        self.count += 1
+        self.boxes = None
+
+    def remove_internal(self, sprite):
+        """精灵被移除后只在数组中标记为死亡；编组清空时重置数组"""
+        i = self.index[sprite]
+        if self.dirty: # 移除后sync()不再更新它，先写回它自己的位置
+            self.sync_views([i])
+        super(FleetGroup, self).remove_internal(sprite)
+        del self.index[sprite]
+        self.alive[i] = False
+        if not self.index:
+            self.views = []
+            self.count = 0
+            self.boxes = None
+
+    def sync(self):
+        """把数组中的位置写回所有活着的精灵的rect"""
+        if not self.dirty:
+            return
+        n = self.count
+        xs = self.x[:n].tolist()
+        lefts = rect_coords(self.x[:n]).tolist()
+        tops = self.y[:n].tolist()
+        views = self.views
+        for i in np.flatnonzero(self.alive[:n]).tolist():
+            sprite = views[i]
+            sprite.x = xs[i]
+            sprite.rect.topleft = (lefts[i], tops[i])
+        self.dirty = False
+
+    def sync_views(self, indices):
+        """只把指定下标的位置写回精灵，dirty保持不变（其余精灵仍待写回）"""
+        if not indices:
+            return
+        xs = self.x[indices]
+        lefts = rect_coords(xs).tolist()
+        tops = self.y[indices].tolist()
+        views = self.views
+        for i, x, left, top in zip(indices, xs.tolist(), lefts, tops):
+            sprite = views[i]
+            sprite.x = x
+            sprite.rect.topleft = (left, top)
+
+    def sprites(self):
+        """任何读取精灵的代码（绘制、pygame碰撞等）拿到的都是最新位置"""
+        self.sync()
+        return super(FleetGroup, self).sprites()
+
+    def __len__(self):
+        """数量不需要最新位置，不写回（Group.__len__会调用sprites()）"""
+        return len(self.spritedict)
+
+    def __bool__(self):
+        return bool(self.spritedict)
+
+    def update(self, *args):
+        """整群外星人左右移动，与Alien.update相同"""
+        ai_settings = self.ai_settings
+        n = self.count
+        self.x[:n] += ai_settings.alien_speed_factor * ai_settings.tick_dt * ai_settings.fleet_direction
+        self.dirty = True
+        self.boxes = None
+
+    def drop(self, amount):
+        """整群外星人下移"""
+        self.y[:self.count] += amount
+        self.dirty = True
+        self.boxes = None
+
+    def check_edges(self):
+        """是否有活着的外星人到达屏幕左右边缘，与Alien.check_edges相同"""
+        n = self.count
+        alive = self.alive[:n]
+        if not alive.any():
+            return False
+        lefts = rect_coords(self.x[:n][alive])
+        rights = lefts + self.width[:n][alive]
+        return bool(rights.max() >= self.ai_settings.screen_width or lefts.min() <= 0)
+
+    def reached_bottom(self, bottom):
+        """是否有活着的外星人到达屏幕底端"""
+        n = self.count
+        bottoms = self.y[:n] + self.height[:n]
+        return bool((self.alive[:n] & (bottoms >= bottom)).any())
+
+    def collide(self, rect):
+        """返回与矩形相交的活着的外星人，顺序与加入顺序一致"""
+        if rect.width <= 0 or rect.height <= 0: # 与Rect.colliderect一致，空矩形不相交
+            return []
+        n = self.count
+        if self.boxes is None: # 一帧内各颗子弹的查询共用同一组边界
+            lefts = rect_coords(self.x[:n])
+            tops = self.y[:n]
+            self.boxes = (lefts, lefts + self.width[:n], tops, tops + self.height[:n])
+        lefts, rights, tops, bottoms = self.boxes
+        hits = (self.alive[:n]
+                & (lefts < rect.right) & (rights > rect.left)
+                & (tops < rect.bottom) & (bottoms > rect.top))
+        indices = np.flatnonzero(hits).tolist()
+        if self.dirty: # 只写回命中的精灵：每颗子弹查询一次，整群写回是O(外星人数)
+            self.sync_views(indices)
+        views = self.views
+        return [views[i] for i in indices]
+
+    def collider(self, count):
+        """给collision模块使用的碰撞函数"""
+        return self.collide
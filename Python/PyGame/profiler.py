@@ -0,0 +1,189 @@
+# 时间：20261017
+# 功能：逐阶段帧耗时分析
+# 把主循环每个阶段（check_events、ship.update、update_bullets、update_aliens、update_screen…）的耗时
+# 记入环形缓冲区，在可切换的叠加层上显示p50/p95/p99，并可把每帧的记录写入CSV做离线分析
+
+import csv
+import time
+from collections import deque
+
+import pygame
+import text_renderer
+
+PHASES = ('check_events', 'ship.update', 'update_bullets', 'update_aliens',
+          'update_screen', 'prepare_next_fleet')
+
+# 不属于某个阶段、由外部报告的耗时（如垃圾回收暂停，发生在各阶段内部，不计入frame合计）；
+# gc为全部回收的暂停，gc0/gc1/gc2为其中各代回收的暂停
+STATS = ('gc', 'gc0', 'gc1', 'gc2')
+
+
+class PhaseTimer():
+    """计时一个阶段的with语句对象，每个阶段只创建一次"""
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.current[self.name] += time.perf_counter() - self.start
+        return False
+
+
+class NullTimer():
+    """关闭分析时使用的空计时器"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = NullTimer()
+
+active_profiler = None # 最近创建的分析器，供按键切换叠加层
+
+
+def percentile(sorted_values, fraction):
+    """已排序数据的百分位数（最近秩法）"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class FrameProfiler():
+    """逐阶段帧耗时分析器"""
+
+    def __init__(self, ai_settings, phases=PHASES, stats=STATS):
+        """初始化环形缓冲区和CSV输出"""
+        global active_profiler
+        active_profiler = self
+        self.enabled = ai_settings.profiling
+        self.phases = tuple(phases) + ('frame',) + tuple(stats)
+        self.timers = dict((name, PhaseTimer(self, name)) for name in phases)
+        self.history = dict((name, deque(maxlen=ai_settings.profile_window)) for name in self.phases)
+        self.current = dict((name, 0.0) for name in phases)
+        self.current_stats = dict((name, 0.0) for name in stats)
+        self.frames = 0
+        self.ticks = 0 # 本帧推进的逻辑帧数
+
+        self.show_overlay = False
+        self.overlay = None
+        self.overlay_rect = pygame.Rect(0, 0, 0, 0)
+        self.overlay_version = 0
+        self.overlay_interval = 0.5 # 叠加层每隔多少秒刷新一次数字
+        self.overlay_updated = 0.0
+        self.screen_height = ai_settings.screen_height
+
+        self.csv_file = None
+        self.csv_writer = None
+        if self.enabled and ai_settings.profile_csv:
+            self.csv_file = open(ai_settings.profile_csv, 'w', newline='')
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(('frame', 'time', 'ticks') + tuple(name + '_ms' for name in self.phases))
+
+    def phase(self, name):
+        """返回计时某阶段的with语句对象：with profiler.phase('update_screen'): ..."""
+        if not self.enabled:
+            return NULL_TIMER
+        return self.timers[name]
+
+    def record(self, name, seconds):
+        """累加本帧的一项外部耗时，如profiler.record('gc', 0.002)"""
+        if self.enabled:
+            self.current_stats[name] += seconds
+
+    def end_frame(self, ticks=0):
+        """一帧结束：把各阶段累计的耗时存入环形缓冲区并写入CSV"""
+        if not self.enabled:
+            return
+        self.frames += 1
+        current = self.current
+        total = 0.0
+        for name, seconds in current.items():
+            self.history[name].append(seconds)
+            total += seconds
+        self.history['frame'].append(total)
+        current_stats = self.current_stats
+        for name, seconds in current_stats.items():
+            self.history[name].append(seconds)
+
+        if self.csv_writer:
+            row = [self.frames, '{:.6f}'.format(time.perf_counter()), ticks]
+            row.extend('{:.4f}'.format(current.get(name, current_stats.get(name, total)) * 1000.0)
+                       for name in self.phases)
+            self.csv_writer.writerow(row)
+
+        for name in current:
+            current[name] = 0.0
+        for name in current_stats:
+            current_stats[name] = 0.0
+
+    def summary(self):
+        """返回每个阶段的p50/p95/p99（毫秒）"""
+        result = {}
+        for name in self.phases:
+            values = sorted(self.history[name])
+            result[name] = dict((label, percentile(values, fraction) * 1000.0)
+                                for label, fraction in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)))
+        return result
+
+    def toggle_overlay(self):
+        """显示/隐藏叠加层"""
+        self.show_overlay = not self.show_overlay
+        self.overlay_updated = 0.0
+
+    def update_overlay(self):
+        """按固定间隔重新渲染叠加层的文字"""
+        now = time.perf_counter()
+        if self.overlay is not None and now - self.overlay_updated < self.overlay_interval:
+            return
+        self.overlay_updated = now
+        text = text_renderer.get_renderer(None, 24)
+        lines = ['phase               p50     p95     p99  (ms)']
+        for name, values in self.summary().items():
+            lines.append('{:<16}{:>8.2f}{:>8.2f}{:>8.2f}'.format(name, values['p50'], values['p95'], values['p99']))
+        images = [text.font.render(line, True, (255, 255, 255), (0, 0, 0)) for line in lines] # 数字每次都不同，不进文字缓存
+        width = max(image.get_width() for image in images)
+        height = sum(image.get_height() for image in images)
+        self.overlay = pygame.Surface((width + 10, height + 10))
+        y = 5
+        for image in images:
+            self.overlay.blit(image, (5, y))
+            y += image.get_height()
+        self.overlay_rect = self.overlay.get_rect()
+        self.overlay_rect.bottomleft = (0, self.screen_height)
+        self.overlay_version += 1
+
+    def overlay_item(self):
+        """给DirtyRenderer使用的叠加层：(键, 图像, 矩形)；隐藏时返回None"""
+        if not (self.enabled and self.show_overlay):
+            return None
+        self.update_overlay()
+        return (('profiler', self.overlay_version), self.overlay, self.overlay_rect)
+
+    def draw_overlay(self, screen):
+        """直接把叠加层画到屏幕上并提交（整屏重绘模式使用）"""
+        item = self.overlay_item()
+        if item:
+            pygame.display.update(screen.blit(item[1], item[2]))
+
+    def close(self):
+        """关闭CSV文件"""
+        if self.csv_file:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+
+def toggle_overlay():
+    """切换当前分析器叠加层的显示（F3键）"""
+    if active_profiler:
+        active_profiler.toggle_overlay()
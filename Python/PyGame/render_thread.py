@@ -0,0 +1,134 @@
+# 时间：20261017
+# 功能：独立的渲染线程
+# 主线程按固定tick_rate处理事件、推进逻辑，每轮结束时把画面需要的状态拷贝成不可变快照放进双缓冲；
+# 渲染线程按max_fps绘制最新的两个快照之间的插值画面。blit、flip期间pygame释放GIL，
+# 渲染卡顿时主线程照常读取输入、推进逻辑，输入延迟不受影响
+
+import threading
+import time
+from collections import namedtuple
+
+import pygame
+
+import game_functions as gf
+
+# 画面所需的全部状态；只保存数值、元组和不再修改的Surface引用
+Snapshot = namedtuple('Snapshot', ['time', 'game_active', 'ship', 'aliens', 'bullets', 'hud', 'countdown'])
+
+
+def take_snapshot(ai_settings, screen, stats, sb, ship, aliens, bullets):
+    """在主线程里拷贝当前状态"""
+    # 精灵对象本身作为键：快照持有引用，前后两个快照之间不会出现被回收后重用的对象
+    alien_items = tuple((alien, alien.rect.x, alien.rect.y) for alien in aliens.sprites())
+    bullet_items = tuple((bullet, tuple(bullet.rect)) for bullet in bullets.sprites())
+    hud = [(sb.score_image, sb.score_rect.copy()), (sb.high_score_image, sb.high_score_rect.copy()),
+           (sb.level_image, sb.level_rect.copy())]
+    hud.extend((icon.image, icon.rect.copy()) for icon in sb.ships.sprites())
+    countdown = gf.respawn_countdown(ai_settings, stats, screen.get_rect())
+    return Snapshot(time.perf_counter(), stats.game_active, (ship.image, ship.rect.copy()),
+                    alien_items, bullet_items, tuple(hud), countdown)
+
+
+class SnapshotBuffer():
+    """双缓冲：保存最近发布的两个快照，读写都只是一次引用赋值"""
+
+    def __init__(self):
+        """初始化缓冲区"""
+        self.pair = (None, None) # (上一个快照, 最新快照)
+        self.published = threading.Event() # 第一个快照发布后渲染线程才开始绘制
+
+    def publish(self, snapshot):
+        """主线程发布新快照，最新的变成上一个"""
+        self.pair = (self.pair[1], snapshot)
+        self.published.set()
+
+    def latest(self):
+        """返回 (上一个快照, 最新快照)"""
+        return self.pair
+
+
+def lerp(old, new, alpha):
+    """线性插值"""
+    return old + (new - old) * alpha
+
+
+class RenderThread(threading.Thread):
+    """按max_fps绘制快照的后台线程"""
+
+    def __init__(self, ai_settings, screen, play_button):
+        """初始化渲染线程；start()之后开始绘制"""
+        super(RenderThread, self).__init__(name='render')
+        self.daemon = True
+        self.ai_settings = ai_settings
+        self.screen = screen
+        self.play_button = play_button
+        self.buffer = SnapshotBuffer()
+        self.stopped = threading.Event()
+        self.clock = pygame.time.Clock()
+        self.frames = 0 # 已绘制的帧数
+
+    def publish(self, snapshot):
+        """主线程调用：发布新快照"""
+        self.buffer.publish(snapshot)
+
+    def alpha(self, previous, latest):
+        """按距离最新快照的时间，返回上一个快照到最新快照之间的插值比例（0~1）"""
+        interval = latest.time - previous.time
+        if interval <= 0:
+            return 1.0
+        return min(1.0, (time.perf_counter() - latest.time) / interval)
+
+    def draw(self, previous, latest):
+        """绘制两个快照之间的插值画面"""
+        screen = self.screen
+        screen.fill(self.ai_settings.bg_color)
+        alpha = self.alpha(previous, latest) if previous else 1.0
+
+        old_bullets = dict(previous.bullets) if previous else {}
+        color = self.ai_settings.bullet_color
+        for bullet, rect in latest.bullets:
+            old = old_bullets.get(bullet)
+            left, top, width, height = rect
+            if old and old[1] >= top: # 子弹只向上飞；子弹池复用的槽位会跳回飞船位置，不插值
+                top = int(lerp(old[1], top, alpha))
+            pygame.draw.rect(screen, color, (left, top, width, height))
+
+        image, rect = latest.ship
+        if previous and previous.ship[1].y == rect.y:
+            rect = rect.move(int(lerp(previous.ship[1].x, rect.x, alpha)) - rect.x, 0)
+        screen.blit(image, rect)
+
+        old_aliens = dict((alien, (x, y)) for alien, x, y in previous.aliens) if previous else {}
+        for alien, x, y in latest.aliens:
+            old = old_aliens.get(alien)
+            if old:
+                x, y = int(lerp(old[0], x, alpha)), int(lerp(old[1], y, alpha))
+            screen.blit(alien.image, (x, y))
+
+        if latest.countdown:
+            screen.blit(*latest.countdown)
+        for image, rect in latest.hud:
+            screen.blit(image, rect)
+        if not latest.game_active:
+            self.play_button.draw_button()
+        pygame.display.flip()
+        self.frames += 1
+
+    def run(self):
+        """渲染循环：不等待逻辑，每帧取最新的两个快照"""
+        self.buffer.published.wait()
+        while not self.stopped.is_set():
+            previous, latest = self.buffer.latest()
+            self.draw(previous, latest)
+            self.clock.tick(self.ai_settings.max_fps)
+
+    def stop(self):
+        """停止渲染线程并等待它退出"""
+        self.stopped.set()
+        self.buffer.published.set()
+        if self.is_alive():
+            self.join()
+
+    def get_fps(self):
+        """返回渲染线程的实际帧率"""
+        return self.clock.get_fps()
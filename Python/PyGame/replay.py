@@ -0,0 +1,163 @@
+# 时间：20261017
+# 功能：确定性的输入录制与极速回放
+# run_game把每个逻辑帧的输入（按键按下/松开、点击Play）和随机数种子写入紧凑的二进制日志；
+# 回放时在无窗口模式下用同样的游戏逻辑、不限帧地重放，并输出每帧的状态校验和，
+# 用来得到可重复的性能测试负载，也能发现改变了游戏行为的优化
+
+import os
+import random
+import struct
+import sys
+import time
+import zlib
+
+import pygame
+
+MAGIC = b'AIRL'
+VERSION = 1
+HEADER = struct.Struct('<4sHIHI') # 魔数, 版本, 随机数种子, tick_rate, 校验和间隔
+RECORD = struct.Struct('<IBII') # 逻辑帧号, 类型, 参数a, 参数b
+
+KEYDOWN = 1 # a=按键
+KEYUP = 2 # a=按键
+CLICK = 3 # a=x, b=y
+CHECKSUM = 4 # a=状态校验和
+END = 5 # 录制结束，帧号为总逻辑帧数
+
+
+def state_checksum(ai_settings, stats, ship, aliens, bullets):
+    """计算影响游戏进程的全部状态的CRC32"""
+    data = [struct.pack('<dqqq???d', ship.center, stats.score, stats.level, stats.ships_left,
+                        stats.game_active, ship.moving_left, ship.moving_right, ai_settings.fleet_direction)]
+    for bullet in bullets.sprites():
+        data.append(struct.pack('<d4i', bullet.y, *bullet.rect))
+    for alien in aliens.sprites():
+        data.append(struct.pack('<d4i', alien.x, *alien.rect))
+    return zlib.crc32(b''.join(data)) & 0xffffffff
+
+
+class InputRecorder():
+    """把输入事件按逻辑帧号写入二进制日志"""
+
+    def __init__(self, path, ai_settings, seed=None):
+        """创建日志文件并写入文件头；seed为None时随机生成并用它初始化random"""
+        if seed is None:
+            seed = int.from_bytes(os.urandom(4), 'little')
+        random.seed(seed)
+        self.seed = seed
+        self.tick = 0 # 已经执行的逻辑帧数，由主循环更新
+        self.interval = ai_settings.replay_checksum_interval
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, ai_settings.tick_rate, self.interval))
+
+    def record(self, event):
+        """记录一个pygame事件（只记录影响游戏逻辑的事件）"""
+        if event.type == pygame.KEYDOWN:
+            self.file.write(RECORD.pack(self.tick, KEYDOWN, event.key, 0))
+        elif event.type == pygame.KEYUP:
+            self.file.write(RECORD.pack(self.tick, KEYUP, event.key, 0))
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            mouse_x, mouse_y = pygame.mouse.get_pos() # 与check_events一样使用当前光标位置
+            self.file.write(RECORD.pack(self.tick, CLICK, max(mouse_x, 0), max(mouse_y, 0)))
+
+    def end_tick(self, ai_settings, stats, ship, aliens, bullets):
+        """一个逻辑帧执行完：帧号加1，按间隔记录状态校验和"""
+        self.tick += 1
+        if self.interval and self.tick % self.interval == 0:
+            value = state_checksum(ai_settings, stats, ship, aliens, bullets)
+            self.file.write(RECORD.pack(self.tick, CHECKSUM, value, 0))
+
+    def close(self):
+        """写入结束标记并关闭日志文件"""
+        if self.file:
+            self.file.write(RECORD.pack(self.tick, END, 0, 0))
+            self.file.close()
+            self.file = None
+
+
+def read_log(path):
+    """读取日志，返回 (文件头字典, 记录列表)"""
+    with open(path, 'rb') as log:
+        data = log.read()
+    magic, version, seed, tick_rate, interval = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("不是有效的输入日志：{}".format(path))
+    records = [RECORD.unpack_from(data, offset)
+               for offset in range(HEADER.size, len(data) - RECORD.size + 1, RECORD.size)]
+    header = {'seed': seed, 'tick_rate': tick_rate, 'checksum_interval': interval}
+    return header, records
+
+
+def replay(path, ai_settings=None, on_checksum=None):
+    """不限帧地回放日志，返回 (逻辑帧数, 耗时秒数, 每帧校验和列表, 与录制时不一致的帧号列表)"""
+    import headless # 设置dummy驱动，回放时不开窗口
+    import game_functions as gf
+    from settings import Settings
+
+    header, records = read_log(path)
+    ai_settings = ai_settings or Settings()
+    ai_settings.set_tick_rate(header['tick_rate'])
+    random.seed(header['seed'])
+    game = headless.HeadlessGame(ai_settings)
+    screen, stats, sb, ship = game.screen, game.stats, game.sb, game.ship
+    aliens, bullets, play_button = game.aliens, game.bullets, game.play_button
+
+    checksums = []
+    mismatches = []
+    end_tick = records[-1][0] if records else 0
+    tick = 0
+    index = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            # 应用这一逻辑帧之前发生的所有事件
+            while index < len(records) and records[index][0] <= tick:
+                record_tick, kind, a, b = records[index]
+                index += 1
+                if kind == KEYDOWN:
+                    gf.check_keydown_events(pygame.event.Event(pygame.KEYDOWN, key=a),
+                                            ai_settings, screen, ship, bullets)
+                elif kind == KEYUP:
+                    gf.check_keyup_events(pygame.event.Event(pygame.KEYUP, key=a), ship)
+                elif kind == CLICK:
+                    gf.check_play_button(ai_settings, screen, stats, sb, play_button,
+                                         ship, aliens, bullets, a, b)
+                elif kind == CHECKSUM and a != checksums[record_tick - 1]:
+                    mismatches.append(record_tick)
+            if tick >= end_tick:
+                break
+            if not game.update_logic():
+                # 游戏未进行时帧号不前进，之后的事件仍属于这一帧；没有这样的事件说明回放与录制不一致
+                if index >= len(records) or records[index][0] > tick:
+                    mismatches.append(tick)
+                    break
+                continue
+            tick += 1
+            value = state_checksum(ai_settings, stats, ship, aliens, bullets)
+            checksums.append(value)
+            if on_checksum:
+                on_checksum(tick, value)
+    except SystemExit: # 录制时按了Q退出
+        pass
+    elapsed = time.perf_counter() - start
+    return tick, elapsed, checksums, mismatches
+
+
+def main(argv=None):
+    """命令行入口：python replay.py 日志文件 [校验和输出文件]"""
+    argv = sys.argv[1:] if argv is None else argv
+    out = open(argv[1], 'w') if len(argv) > 1 else None
+    on_checksum = (lambda tick, value: out.write('{} {:08x}\n'.format(tick, value))) if out else None
+    ticks, elapsed, checksums, mismatches = replay(argv[0], on_checksum=on_checksum)
+    if out:
+        out.close()
+    rate = ticks / elapsed if elapsed > 0 else 0.0
+    print("ticks: {}  seconds: {:.3f}  ticks/sec: {:,.0f}".format(ticks, elapsed, rate))
+    if mismatches:
+        print("checksum mismatch at ticks: {}".format(mismatches[:10]))
+        sys.exit(1)
+    print("final checksum: {:08x}".format(checksums[-1] if checksums else 0))
+
+
+if __name__ == '__main__':
+    main()
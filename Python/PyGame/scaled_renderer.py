@@ -0,0 +1,105 @@
+# 时间：20261017
+# 功能：自适应内部分辨率渲染
+# 游戏画面（子弹、飞船、外星人）先画到较小的内部Surface上，再用pygame.transform.scale放大到窗口；
+# 内部缩放比例按测得的帧耗时自动调整以保持max_fps，HUD和Play按钮仍按窗口原始分辨率绘制。游戏逻辑不受影响
+
+import pygame
+import game_functions as gf
+
+
+class ScaledRenderer():
+    """按内部分辨率绘制画面、按帧耗时调整缩放比例的渲染器"""
+
+    def __init__(self, ai_settings, screen, clock, hud=None):
+        """初始化渲染器；clock为GameClock，用来读取上一帧的实际耗时（不含等待）"""
+        self.ai_settings = ai_settings
+        self.screen = screen
+        self.clock = clock
+        self.hud = hud
+        self.overlays = [] # 画在最上层的调试叠加层，提供draw_overlay(screen)，如profiler.FrameProfiler
+        self.scale = 1.0 # 当前内部分辨率与窗口分辨率之比
+        self.surface = None # 当前比例下的内部Surface
+        self.images = {} # 原贴图 -> 当前比例下缩小的贴图
+        self.frame_ms = 0.0 # 帧耗时的指数滑动平均（毫秒）
+        self.cooldown = 0 # 调整比例后等待几帧再判断，避免来回跳动
+
+    def set_scale(self, scale):
+        """切换内部分辨率，清空缩小贴图的缓存"""
+        ai_settings = self.ai_settings
+        scale = min(1.0, max(ai_settings.render_scale_min, round(scale, 2)))
+        if scale == self.scale and (scale == 1.0 or self.surface):
+            return
+        self.scale = scale
+        self.images.clear()
+        if scale == 1.0:
+            self.surface = None # 原始分辨率时直接画到屏幕上，省去放大
+        else:
+            size = (max(1, int(ai_settings.screen_width * scale)), max(1, int(ai_settings.screen_height * scale)))
+            self.surface = pygame.Surface(size).convert()
+
+    def adapt(self):
+        """按上一帧的耗时调整内部分辨率：超出目标帧时长就降低，远低于目标就提高"""
+        ai_settings = self.ai_settings
+        if not ai_settings.max_fps:
+            return
+        self.frame_ms += (self.clock.clock.get_rawtime() - self.frame_ms) * 0.1
+        if self.cooldown > 0:
+            self.cooldown -= 1
+            return
+        target_ms = 1000.0 / ai_settings.max_fps
+        step = ai_settings.render_scale_step
+        if self.frame_ms > target_ms and self.scale > ai_settings.render_scale_min:
+            self.set_scale(self.scale - step)
+        elif self.frame_ms < target_ms * ai_settings.render_scale_headroom and self.scale < 1.0:
+            self.set_scale(self.scale + step)
+        else:
+            return
+        self.cooldown = ai_settings.render_scale_cooldown
+
+    def scaled(self, image):
+        """返回按当前比例缩小的贴图，每张贴图每个比例只缩放一次"""
+        small = self.images.get(image)
+        if small is None:
+            width, height = image.get_size()
+            size = (max(1, int(round(width * self.scale))), max(1, int(round(height * self.scale))))
+            small = self.images[image] = pygame.transform.scale(image, size)
+        return small
+
+    def draw_playfield(self, ship, aliens, bullets):
+        """在内部Surface上绘制子弹、飞船和外星人"""
+        surface, scale = self.surface, self.scale
+        surface.fill(self.ai_settings.bg_color)
+        for bullet in bullets.sprites(): # 子弹在飞船和外星人后面
+            rect = bullet.rect
+            pygame.draw.rect(surface, bullet.color, (int(rect.x * scale), int(rect.y * scale),
+                                                     max(1, int(round(rect.width * scale))),
+                                                     max(1, int(round(rect.height * scale)))))
+        surface.blit(self.scaled(ship.image), (int(ship.rect.x * scale), int(ship.rect.y * scale)))
+        for alien in aliens.sprites():
+            surface.blit(self.scaled(alien.image), (int(alien.rect.x * scale), int(alien.rect.y * scale)))
+        pygame.transform.scale(surface, self.screen.get_size(), self.screen)
+
+    def update_screen(self, stats, sb, ship, aliens, bullets, play_button):
+        """绘制一帧：画面按内部分辨率，HUD按原始分辨率"""
+        self.adapt()
+        screen = self.screen
+        if self.surface is None:
+            screen.fill(self.ai_settings.bg_color)
+            for bullet in bullets.sprites():
+                bullet.draw_bullet()
+            ship.blitme()
+            aliens.draw(screen)
+        else:
+            self.draw_playfield(ship, aliens, bullets)
+        countdown = gf.respawn_countdown(self.ai_settings, stats, screen.get_rect())
+        if countdown: # 文字按原始分辨率绘制
+            screen.blit(*countdown)
+        if self.hud:
+            self.hud.draw()
+        else:
+            sb.show_score()
+            if not stats.game_active:
+                play_button.draw_button()
+        for overlay in self.overlays:
+            overlay.draw_overlay(screen)
+        pygame.display.flip()
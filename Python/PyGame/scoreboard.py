@@ -3,6 +3,7 @@
 import pygame.font
 from ship import Ship
 from pygame.sprite import Group
+import text_renderer
 
 class Scoreboard():
     """显示得分信息的类"""
@@ -16,7 +17,8 @@ class Scoreboard():
 
         # 显示得分信息时使用的字体设置
         self.text_color = (30, 30, 30)
-        self.font = pygame.font.SysFont(None, 48)
+        self.text = text_renderer.get_renderer(None, 48) # 字形图集渲染，同一串文字只合成一次
+        self.font = self.text.font
 
         # 准备初始得分图像
         self.prep_score() 
@@ -29,7 +31,7 @@ class Scoreboard():
         """将得分转换为一幅渲染的图像"""
         rounded_score = int(round(self.stats.score, -1)) #精确小数点后多少位，第个参数控制位数 －1为10的整数倍
         score_str = "{:,}".format(rounded_score)
-        self.score_image = self.font.render(score_str, True, self.text_color, self.ai_settings.bg_color)
+        self.score_image = self.text.render(score_str, self.text_color, self.ai_settings.bg_color)
 
         # 将得分放在屏幕右上角
         self.score_rect = self.score_image.get_rect()
@@ -40,7 +42,7 @@ class Scoreboard():
         # 将最高得分转换为渲染的图像
         high_score = int(round(self.stats.high_score, -1))
         high_score_str = "{:,}".format(high_score)
-        self.high_score_image = self.font.render(high_score_str, True, self.text_color, self.ai_settings.bg_color) 
+        self.high_score_image = self.text.render(high_score_str, self.text_color, self.ai_settings.bg_color)
 
 
         # 将最高分放在屏中央
@@ -50,7 +52,7 @@ class Scoreboard():
 
     def prep_level(self):
         """将等级转换为渲染的图像"""
-        self.level_image = self.font.render(str(self.stats.level), True, self.text_color, self.ai_settings.bg_color)
+        self.level_image = self.text.render(str(self.stats.level), self.text_color, self.ai_settings.bg_color)
 
         # 将等级放在得分下方
         self.level_rect = self.level_image.get_rect()
@@ -1,6 +1,8 @@
 # 时间：20201015
 # 功能：12.3.3 创建设置类
 
+from telemetry import telemetry
+
 class Settings():
     """存储《外星人入侵》的所有设置的类"""
     
@@ -12,23 +14,68 @@ class Settings():
         self.screen_width = 1200 #屏宽
         self.screen_height = 800    #屏高
         self.bg_color = (230, 230, 230) #屏色
+        self.hud_overlay = True # 得分、飞船、Play按钮合成到缓存的叠加层上（见hud.py）
+        self.dirty_rect_rendering = True # 只重绘变化区域（见dirty_renderer.py），False则每帧整屏重绘
         
-        # 飞船设置
-        self.ship_speed_factor = 10 # 飞船的速度
+        # 帧率设置：逻辑按固定步长推进，与机器快慢无关
+        self.set_tick_rate(60) # 每秒逻辑帧数
+        self.max_catch_up_ticks = 5 # 一个渲染帧内最多补几次逻辑帧
+        self.max_fps = 60 # 渲染帧率上限
+        self.adaptive_resolution = False # True：画面按内部分辨率绘制后放大，比例随帧耗时自动调整（见scaled_renderer.py）
+        self.render_scale_min = 0.5 # 内部分辨率最低为窗口的几倍
+        self.render_scale_step = 0.1 # 每次调整的比例
+        self.render_scale_headroom = 0.6 # 帧耗时低于目标帧时长的这个比例时才提高分辨率
+        self.render_scale_cooldown = 30 # 调整后至少等待几帧再判断
+        self.render_thread = False # True：主线程按tick_rate推进逻辑，另起线程按max_fps绘制插值画面（见render_thread.py）
+
+        # 帧耗时分析（见profiler.py，游戏中按F3显示/隐藏）
+        self.profiling = False
+        self.profile_csv = None # 每帧记录写入的CSV文件路径
+        self.profile_window = 600 # 环形缓冲区保存最近多少帧
+
+        # 输入录制（见replay.py）
+        self.record_path = None # 录制输入日志的文件路径，None表示不录制
+        self.replay_checksum_interval = 60 # 录制时每隔多少逻辑帧写入一次状态校验和
+
+        # 垃圾回收（见gc_policy.py）
+        self.gc_mode = 'limited' # 关卡进行中：'limited' 推迟第0代回收；'disabled' 关闭自动回收；'default' 不冻结、不显式回收、不干预
+        self.gc_level_threshold = 20000 # 'limited'时第0代的回收阈值（Python默认700）
+
+        # 内存跟踪（见memory_tracker.py），默认关闭
+        self.memory_report = None # 报告文件路径；设置后用tracemalloc在过关和飞船被撞时拍快照
+        self.memory_top = 10 # 每个快照列出增长最多的几个源代码行
+        self.memory_frames = 1 # tracemalloc为每次分配保存的调用栈层数
+
+        # 遥测（见telemetry.py），代替控制台打印
+        self.telemetry_path = None # JSON-lines输出文件，None表示只累加计数器
+        self.telemetry_sample = {'bullets': 60} # 事件名 -> 每N次记录1次
+        self.telemetry_rate_limit = {'ship_hit': 10} # 事件名 -> 每秒最多记录条数
+        self.telemetry_flush_interval = 1.0 # 后台线程写文件的间隔（秒）
+
+        # 飞船设置（所有速度的单位都是 像素/秒，由原来的 每帧像素数×60帧 换算，飞船:子弹:外星人 仍为1:3:1）
+        self.ship_speed_factor = 60 # 飞船的速度
         self.ship_limit = 3
+        self.ship_hit_pause = 0.5 # 飞船被撞后暂停的秒数（无窗口模拟时跳过）
         
         # 子弹设置
-        self.bullet_speed_factor = 3 #速度
+        self.bullet_speed_factor = 180 #速度
         self.bullet_width = 160  #图宽
         self.bullet_height = 15  #图高
         self.bullet_color = 60, 60, 60  #图色
         self.bullet_allowed = 3 #数量
+        self.bullet_pooling = True # 子弹从预先分配的子弹池里复用（见bullet.BulletPool），False则每次新建Bullet精灵
 
         # 外星人设置
-        self.alien_speed_factor = 0.5 
-        self.fleet_drop_speed = 5
+        self.alien_speed_factor = 60
+        self.fleet_drop_speed = 5 # 每次触边下移的像素数
         # fleet_direction 为1表示向右移，为－1表示向左移
         self.fleet_direction = 1
+        self.collision_cell_size = 120 # 碰撞网格的格子边长（像素），约为外星人间距
+        self.collision_grid_pairs = 10000 # 子弹数×外星人数达到这个值才启用碰撞网格
+        self.pixel_collision = True # 矩形相交后再按贴图的像素掩码精确判断，贴图不必为了避免误判而缩小
+        self.swept_collision = True # 子弹按这个逻辑帧扫过的整段路径检测碰撞，高速关卡也不会穿过外星人
+        self.fleet_prebuild_per_frame = 8 # 每帧空闲时最多预先创建几个下一波的外星人
+        self.fleet_backend = 'sprite' # 'sprite'：逐个精灵更新；'numpy'：位置放在NumPy数组里整批更新（需要numpy，见numpy_fleet.py）
 
         # 以什么样的速度加快游戏节奏
         self.speedup_scale = 3
@@ -37,9 +84,9 @@ class Settings():
 
     def initialize_dynamic_settings(self):
         """初始化游戏，动态属性设置"""
-        self.ship_speed_factor = 1
-        self.bullet_speed_factor = 3
-        self.alien_speed_factor = 1
+        self.ship_speed_factor = 60
+        self.bullet_speed_factor = 180
+        self.alien_speed_factor = 60
 
         # fleet_direction为1表示向右；为-1表示向左
         self.fleet_direction = 1
@@ -47,6 +94,11 @@ class Settings():
         # 记分：外星人一个多少
         self.alien_points = 50
 
+    def set_tick_rate(self, tick_rate):
+        """设置每秒逻辑帧数，并更新每帧的时长（秒）"""
+        self.tick_rate = tick_rate
+        self.tick_dt = 1.0 / tick_rate
+
     def increase_speed(self):
         """提高速度设置和外星人点数"""
         self.ship_speed_factor *= self.speedup_scale
@@ -54,6 +106,6 @@ class Settings():
         self.alien_speed_factor *= self.speedup_scale        
 
         self.alien_points = int(self.alien_points * self.score_scale)
-        print(self.alien_points)
+        telemetry.event('speed_up', alien_points=self.alien_points)
 
         
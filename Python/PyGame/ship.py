@@ -3,6 +3,7 @@
 
 import pygame
 from pygame.sprite import Sprite
+from assets import load_image, load_mask
 
 class Ship(Sprite): #功能继承
 
@@ -14,9 +15,9 @@ class Ship(Sprite): #功能继承
         self.screen = screen
         self.ai_settings = ai_settings
         # 加载飞船图像并获取其外接矩形
-        self.image = pygame.image.load(r'E:\Python-Substance\Python\PyGame\images\ship.bmp') #加载图像
-        # 如果报错，需要给绝对路径
+        self.image = load_image('ship.bmp') #加载图像 飞船和记分牌上的生命图标共享同一张贴图
         self.rect = self.image.get_rect()   #获取贴图属性 矩形高效
+        self.mask = load_mask('ship.bmp') # 像素碰撞用的掩码
         self.screen_rect = screen.get_rect()    #获取画布属性
 
         # 将每艘新飞船放在屏幕底部中央
@@ -34,9 +35,9 @@ class Ship(Sprite): #功能继承
     def update(self):
         """根据移动标志调整飞船的位置"""
         if self.moving_right and self.rect.right < self.screen_rect.right: # 限制在屏幕范围内
-            self.center += self.ai_settings.ship_speed_factor  #向右移动
+            self.center += self.ai_settings.ship_speed_factor * self.ai_settings.tick_dt  #向右移动 速度×每帧时长
         if self.moving_left and self.rect.left > 0: # 限制在屏幕范围内
-            self.center -= self.ai_settings.ship_speed_factor  #向右移动
+            self.center -= self.ai_settings.ship_speed_factor * self.ai_settings.tick_dt  #向左移动
         
         self.rect.centerx = self.center #根据self.center更新rect对象      
     
@@ -0,0 +1,128 @@
+# 时间：20261017
+# 功能：启动耗时分析
+# alien_invasion.py --startup-profile时，在导入其他模块之前替换__import__，记录每个模块第一次导入的耗时（含其依赖），
+# 并记录run_game里每个初始化步骤、第一帧出现和全部初始化完成的时间，最后输出到stderr
+
+import builtins
+import sys
+import time
+
+active_profile = None # 当前的启动分析；为None时step()不计时
+
+
+class NullStep():
+    """未开启分析时使用的空步骤"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_STEP = NullStep()
+
+
+class Step():
+    """计时一个初始化步骤的with语句对象"""
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profile.steps.append((self.name, time.perf_counter() - self.start))
+        return False
+
+
+class StartupProfile():
+    """记录模块导入和初始化步骤的耗时"""
+
+    def __init__(self):
+        """从创建时开始计时"""
+        self.started = time.perf_counter()
+        self.imports = [] # [深度, 模块名, 耗时]，按开始导入的顺序
+        self.steps = [] # (步骤名, 耗时)
+        self.marks = [] # (事件名, 距开始的时间)
+        self.depth = 0
+        self.original_import = None
+
+    def install(self):
+        """替换__import__，开始记录导入耗时"""
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.timed_import
+
+    def uninstall(self):
+        """恢复原来的__import__"""
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """只对第一次导入的模块计时；已导入的模块直接返回"""
+        if level or name in sys.modules:
+            return self.original_import(name, globals, locals, fromlist, level)
+        entry = [self.depth, name, 0.0]
+        self.imports.append(entry) # 先占位，保持开始导入的顺序
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            entry[2] = time.perf_counter() - start
+            self.depth -= 1
+
+    def mark(self, name):
+        """记录一个时间点，如第一帧出现"""
+        self.marks.append((name, time.perf_counter() - self.started))
+
+    def report(self, out=None, min_ms=1.0):
+        """输出导入、初始化步骤和时间点（毫秒）；耗时不到min_ms的导入省略"""
+        out = out or sys.stderr
+        print("imports (ms, including dependencies, < {} ms omitted):".format(min_ms), file=out)
+        for depth, name, seconds in self.imports:
+            if seconds * 1000.0 < min_ms:
+                continue
+            print("  {:>8.1f}  {}{}".format(seconds * 1000.0, '  ' * depth, name), file=out)
+        print("init steps (ms):", file=out)
+        for name, seconds in self.steps:
+            print("  {:>8.1f}  {}".format(seconds * 1000.0, name), file=out)
+        for name, seconds in self.marks:
+            print("{}: {:.1f} ms after start".format(name, seconds * 1000.0), file=out)
+
+
+def start():
+    """开启启动分析并开始记录导入"""
+    global active_profile
+    active_profile = StartupProfile()
+    active_profile.install()
+    return active_profile
+
+
+def step(name):
+    """返回计时某个初始化步骤的with语句对象：with startup_profile.step('display'): ..."""
+    if active_profile is None:
+        return NULL_STEP
+    return Step(active_profile, name)
+
+
+def mark(name):
+    """开启分析时记录一个时间点"""
+    if active_profile is not None:
+        active_profile.mark(name)
+
+
+def finish():
+    """初始化全部完成：停止记录导入并输出报告"""
+    global active_profile
+    if active_profile is None:
+        return
+    active_profile.mark('ready')
+    active_profile.uninstall()
+    active_profile.report()
+    active_profile = None
@@ -0,0 +1,112 @@
+# 时间：20261017
+# 功能：结构化遥测
+# 代替主循环里的print：事件先缓存在内存里，由后台线程定期写成JSON-lines文件；
+# 每种事件可以按 每N次记录1次 采样，并限制每秒最多记录多少条；计数器始终累加
+
+import json
+import threading
+import time
+from collections import deque
+
+# 事件类型 -> 字段
+EVENTS = {
+    'bullets': ('count',), # 每个逻辑帧的子弹数
+    'ship_hit': ('cause', 'ships_left'), # 飞船被撞：'collision' 撞到外星人，'bottom' 外星人到达底端
+    'speed_up': ('alien_points',), # 过关提速后的外星人点数
+}
+
+
+class Telemetry():
+    """遥测事件与计数器"""
+
+    def __init__(self):
+        """初始化；configure()之前只累加计数器，不记录事件"""
+        self.counters = {} # 事件名 -> 发生次数
+        self.dropped = {} # 事件名 -> 因采样或限速被丢弃的次数
+        self.sample = {} # 事件名 -> 每N次记录1次
+        self.rate_limit = {} # 事件名 -> 每秒最多记录条数
+        self.tokens = {} # 事件名 -> (剩余令牌, 上次补充时间)
+        self.fields = dict((name, tuple(sorted(fields))) for name, fields in EVENTS.items())
+        self.buffer = deque()
+        self.file = None
+        self.thread = None
+        self.stop = threading.Event()
+        self.flush_interval = 1.0
+
+    def configure(self, ai_settings):
+        """按设置打开输出文件并启动后台写入线程"""
+        self.sample = dict(ai_settings.telemetry_sample)
+        self.rate_limit = dict(ai_settings.telemetry_rate_limit)
+        self.flush_interval = ai_settings.telemetry_flush_interval
+        if ai_settings.telemetry_path and self.file is None:
+            self.file = open(ai_settings.telemetry_path, 'a')
+            self.stop.clear()
+            self.thread = threading.Thread(target=self.run, name='telemetry')
+            self.thread.daemon = True
+            self.thread.start()
+
+    def event(self, name, **fields):
+        """记录一个事件"""
+        if tuple(sorted(fields)) != self.fields[name]:
+            raise ValueError("遥测事件{}的字段应为{}".format(name, EVENTS[name]))
+        count = self.counters.get(name, 0) + 1
+        self.counters[name] = count
+        if self.file is None:
+            return
+        every = self.sample.get(name)
+        if (every and count % every) or not self.take_token(name):
+            self.dropped[name] = self.dropped.get(name, 0) + 1
+            return
+        fields['event'] = name
+        fields['time'] = time.time()
+        self.buffer.append(fields) # deque.append是线程安全的，主循环不等待磁盘
+
+    def take_token(self, name):
+        """令牌桶限速：没有限速或还有令牌时返回True"""
+        limit = self.rate_limit.get(name)
+        if not limit:
+            return True
+        now = time.monotonic()
+        tokens, last = self.tokens.get(name, (limit, now))
+        tokens = min(limit, tokens + (now - last) * limit)
+        if tokens < 1:
+            self.tokens[name] = (tokens, now)
+            return False
+        self.tokens[name] = (tokens - 1, now)
+        return True
+
+    def count(self, name, amount=1):
+        """只累加计数器，不记录事件"""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def run(self):
+        """后台线程：定期把缓存的事件写入文件"""
+        while not self.stop.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """把缓存的事件写成JSON-lines"""
+        lines = []
+        buffer = self.buffer
+        while buffer:
+            lines.append(json.dumps(buffer.popleft()))
+        if lines and self.file:
+            self.file.write('\n'.join(lines) + '\n')
+            self.file.flush()
+
+    def close(self):
+        """停止后台线程，写入剩余事件和计数器，并关闭文件"""
+        if self.file is None:
+            return
+        self.stop.set()
+        self.thread.join()
+        self.file.write(json.dumps({'event': 'counters', 'time': time.time(),
+                                    'counters': self.counters, 'dropped': self.dropped}) + '\n')
+        self.file.close()
+        self.file = None
+        self.thread = None
+
+
+# 整个游戏共用一个遥测实例
+telemetry = Telemetry()
@@ -0,0 +1,114 @@
+# 时间：20261017
+# 功能：字形图集文字渲染
+# font.render每次都要对整串文字做TrueType光栅化；这里每种字体/字号/颜色只光栅化一次每个字符，
+# 之后用缓存的字形拼出字符串，并用LRU缓存整串文字的Surface
+
+from collections import OrderedDict
+
+import pygame
+import pygame.font
+
+PRELOAD_CHARS = '0123456789,' # 分数、等级会用到的字符，创建图集时预先渲染
+
+
+class GlyphAtlas():
+    """一种字体+颜色+背景色下的字形缓存"""
+
+    def __init__(self, font, color, background=None, antialias=True):
+        """初始化图集并预先渲染常用字符"""
+        self.font = font
+        self.color = color
+        self.background = background
+        self.antialias = antialias
+        self.height = font.get_height()
+        self.glyphs = {}
+        for char in PRELOAD_CHARS:
+            self.glyph(char)
+
+    def glyph(self, char):
+        """返回单个字符的图像，第一次使用时才光栅化"""
+        image = self.glyphs.get(char)
+        if image is None:
+            if self.background is None:
+                image = self.font.render(char, self.antialias, self.color)
+            else:
+                image = self.font.render(char, self.antialias, self.color, self.background)
+            self.glyphs[char] = image
+        return image
+
+    def compose(self, text):
+        """用缓存的字形拼出一串文字"""
+        glyphs = [self.glyph(char) for char in text]
+        width = sum(image.get_width() for image in glyphs)
+        if self.background is None:
+            surface = pygame.Surface((max(width, 1), self.height), pygame.SRCALPHA)
+        else:
+            surface = pygame.Surface((max(width, 1), self.height))
+            surface.fill(self.background)
+        x = 0
+        for image in glyphs:
+            surface.blit(image, (x, 0))
+            x += image.get_width()
+        if pygame.display.get_surface() is not None: # 转换为屏幕像素格式，之后的blit更快
+            surface = surface.convert() if self.background is not None else surface.convert_alpha()
+        return surface
+
+
+class TextRenderer():
+    """同一字体下按颜色分图集，并缓存最近使用的整串文字"""
+
+    def __init__(self, font, max_strings=64, antialias=True):
+        """初始化渲染器"""
+        self.font = font
+        self.antialias = antialias
+        self.max_strings = max_strings
+        self.atlases = {} # (颜色, 背景色) -> GlyphAtlas
+        self.strings = OrderedDict() # (文字, 颜色, 背景色) -> Surface，按最近使用排序
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def atlas(self, color, background=None):
+        """返回颜色对应的图集"""
+        key = (tuple(color), tuple(background) if background is not None else None)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(self.font, color, background, self.antialias)
+            self.atlases[key] = atlas
+        return atlas
+
+    def render(self, text, color, background=None):
+        """返回文字图像（与其他调用者共享，不要修改它）"""
+        key = (text, tuple(color), tuple(background) if background is not None else None)
+        surface = self.strings.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.strings.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.atlas(color, background).compose(text)
+        self.strings[key] = surface
+        if len(self.strings) > self.max_strings: # 淘汰最久未使用的字符串
+            self.strings.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def stats(self):
+        """返回缓存统计"""
+        return {'strings': len(self.strings), 'atlases': len(self.atlases),
+                'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+renderers = {} # (字体名, 字号) -> TextRenderer
+
+
+def get_renderer(name=None, size=48):
+    """返回共享的文字渲染器，同一字体、字号只创建一次"""
+    renderer = renderers.get((name, size))
+    if renderer is None:
+        if not pygame.font.get_init(): # run_game不再调用pygame.init()，第一次用到字体时才初始化
+            pygame.font.init()
+        renderer = TextRenderer(pygame.font.SysFont(name, size))
+        renderers[(name, size)] = renderer
+    return renderer
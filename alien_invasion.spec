@@ -1,12 +1,24 @@
 # -*- mode: python ; coding: utf-8 -*-
 
+import os
+import sys
+
 block_cipher = None
 
+# 路径都相对本文件，不再写死E:\盘的绝对路径
+game_dir = os.path.join(SPECPATH, 'Python', 'PyGame')
+
+# 构建前把images目录打包成images.bundle，运行时assets.py用mmap直接读取
+sys.path.insert(0, game_dir)
+import asset_bundle
+bundle_path = os.path.join(game_dir, 'images.bundle')
+asset_bundle.pack(os.path.join(game_dir, 'images'), bundle_path)
+
 
-a = Analysis(['e:\\Python-Substance\\Python\\PyGame\\alien_invasion.py'],
-             pathex=['E:\\Python-Substance'],
+a = Analysis([os.path.join(game_dir, 'alien_invasion.py')],
+             pathex=[game_dir],
              binaries=[],
-             datas=[],
+             datas=[(bundle_path, '.')],
              hiddenimports=[],
              hookspath=[],
              runtime_hooks=[],